@@ -1,20 +1,87 @@
 
+import os
 import re
+from collections import deque, namedtuple
+import itertools
+from operator import methodcaller
 
 from address_extractor import (
-    unit_type,
     zipcode,
-    street_direction,
-    street_type,
     cities,
+    profiling,
+    token_table,
+    vocabulary,
 )
 
+# the maximum number of tokens an address can span
+WINDOW_SIZE = 11
+
+# how many characters to read at a time from file-like objects
+READ_SIZE = 64 * 1024
+
+TOKEN_PATTERN = token_table.TOKEN_PATTERN
+BYTES_TOKEN_PATTERN = re.compile(rb"\S+")
+
+_PUNCTUATION = token_table.PUNCTUATION
+
+TOO_SHORT = "Invalid Address Format - Too short"
+
 class InvalidAddressError(Exception):
     pass
 
+class ScanStats(object):
+    """
+    Counts the candidate windows seen by extract_all. `pruned` candidates
+    were rejected by the prefilter without being parsed.
+    """
+    def __init__(self):
+        self.candidates = 0
+        self.pruned = 0
+
+    @property
+    def parsed(self):
+        return self.candidates - self.pruned
+
+    def __repr__(self):
+        msg = "<address_extractor.ScanStats candidates: {}, pruned: {}>"
+        return msg.format(self.candidates, self.pruned)
+
 class Address(object):
-    def __init__(self, tokens):
-        self.tokens = tuple(self._clean_tokens(tokens[:11]))
+    def __init__(self, tokens, offsets=None, source=None, cache=None,
+                 infer_zipcode=False):
+        """
+        `offsets` are the (start, end) character offsets of `tokens` and
+        `source` is the text they were found in; both are optional and
+        only used by `span` and `source_text`. When a cache.ParseCache is
+        given, the parse of an identical window is reused from it.
+
+        With `infer_zipcode=True` an address may end in its city and state
+        without a zipcode. Its `zipcode` is then None and the zipcodes of
+        the city are given as `zipcode_candidates` instead.
+        """
+        cleaned = tuple(self._clean_tokens(tokens[:WINDOW_SIZE]))
+        if offsets is not None:
+            offsets = tuple(self._clean_offsets(tokens, offsets[:WINDOW_SIZE]))
+        self._start(cleaned, None, offsets, source, cache, infer_zipcode)
+
+    @classmethod
+    def from_table(cls, table, start, source=None, cache=None, infer_zipcode=False):
+        """
+        Makes the Address of the window at raw token `start` of a
+        token_table.TokenTable, which cleans and labels every token once
+        for all the windows that overlap it.
+        """
+        address = cls.__new__(cls)
+        (tokens, labels, offsets) = table.window(start, start + WINDOW_SIZE)
+        address._start(tokens, labels, offsets, source, cache, infer_zipcode)
+        return address
+
+    def _start(self, tokens, labels, offsets, source, cache, infer_zipcode):
+        self.tokens = tokens
+        self.labels = labels
+        self.offsets = offsets
+        self.source = source
+        self.infer_zipcode = infer_zipcode
         self.street_number_index = None
         self.street_direction_index = None
         self.street_name_range = None
@@ -25,24 +92,79 @@ class Address(object):
         self.city_range = None
         self.state_index = None
         self.zipcode_index = None
+        self.zipcode_candidates = None
         self.error = None
-        self._remaining_indices = []
-        self._parse()
+        self._remaining = 0
+        if cache is None:
+            self._parse()
+        else:
+            self._parse_cached(cache)
 
     def _clean_tokens(self, original_tokens):
         tokens = []
         for token in original_tokens:
-            cleaned = token.replace(".", "").replace(",", "")
+            cleaned = token.translate(_PUNCTUATION)
             if cleaned.startswith("#"):
                 cleaned = cleaned.replace("#", "")
                 tokens.append("#")
             tokens.append(cleaned)
         return tokens
 
+    def _clean_offsets(self, original_tokens, original_offsets):
+        # mirrors _clean_tokens, which splits a leading "#" into its own token
+        offsets = []
+        for (token, (start, end)) in zip(original_tokens, original_offsets):
+            if token.translate(_PUNCTUATION).startswith("#"):
+                offsets.append((start, start + 1))
+                start += 1
+            offsets.append((start, end))
+        return offsets
+
+    @property
+    def span(self):
+        """
+        The (start, end) offsets of a valid address in its source text.
+        The span covers whole tokens, including any punctuation that the
+        parser strips from them.
+        """
+        if not self.is_valid or self.offsets is None:
+            return None
+        return (self.offsets[0][0], self.offsets[self.end_index][1])
+
+    @property
+    def source_text(self):
+        """
+        The slice of the source text that the address was extracted from.
+        """
+        span = self.span
+        if span is None or self.source is None:
+            return None
+        return self.source[span[0]:span[1]]
+
     @property
     def is_valid(self):
         return self.error is None
 
+    @property
+    def end_index(self):
+        """
+        The index of the last token of a valid address: its zipcode, or
+        its state when the zipcode was inferred.
+        """
+        if self.zipcode_index is not None:
+            return self.zipcode_index
+        return self.state_index
+
+    @property
+    def coordinates(self):
+        """
+        The (latitude, longitude) of the zipcode of a valid address, e.g.
+        for spatial.nearest_zipcodes and spatial.zipcodes_within.
+        """
+        if not self.is_valid or self.zipcode is None:
+            return None
+        return zipcode.coordinates(self.zipcode)
+
     def _ordered_parts(self):
         return [
             self.street_number,
@@ -64,6 +186,30 @@ class Address(object):
             return ""
         return self._render_parts()
 
+    FIELDS = (
+        "street_number",
+        "street_direction",
+        "street_name",
+        "street_type",
+        "unit",
+        "city",
+        "state",
+        "zipcode",
+    )
+
+    def to_dict(self):
+        """
+        The parsed fields, error and span of the address as a dict, e.g.
+        for serializing to json. Addresses whose zipcode was inferred also
+        have their `zipcode_candidates`.
+        """
+        result = dict((name, getattr(self, name)) for name in self.FIELDS)
+        result["error"] = self.error
+        result["span"] = self.span
+        if self.zipcode_candidates is not None:
+            result["zipcode_candidates"] = list(self.zipcode_candidates)
+        return result
+
     def __repr__(self):
         if self.error is None:
             msg = "<address_extractor.Address address: {addr}>"
@@ -72,27 +218,89 @@ class Address(object):
             msg = "<address_extractor.Address error: {err}, address: {addr}>"
             return msg.format(err=self.error, addr=self._render_parts())
 
+    def _values(self):
+        """
+        The FIELDS, start, end and zipcode_candidates of a valid address as
+        a tuple, read from the tokens directly rather than through the
+        field properties.
+        """
+        tokens = self.tokens
+        values = []
+        for index in (self.street_number_index, self.street_direction_index):
+            values.append(None if index is None else tokens[index])
+        values.append(_join_range(tokens, self.street_name_range))
+        index = self.street_type_index
+        values.append(None if index is None else tokens[index])
+        values.append(_join_range(tokens, self.unit_range))
+        values.append(_join_range(tokens, self.city_range))
+        for index in (self.state_index, self.zipcode_index):
+            values.append(None if index is None else tokens[index])
+        if self.offsets is None:
+            values += [None, None]
+        else:
+            values += [self.offsets[0][0], self.offsets[self.end_index][1]]
+        values.append(self.zipcode_candidates)
+        return tuple(values)
+
     def _parse(self):
         """
         Programmatically and sequentially locate the most predictable parts
         of an address.
+
+        Each stage returns None when it succeeds or the error of the address
+        when it fails, which stops the parse. The tokens that are not yet
+        accounted for are tracked as the bits of `_remaining`.
         """
-        try:
-            self._remaining_indices = list(range(len(self.tokens)))
-            self._extract_street_number()
-            self._extract_state()
-            self._extract_zipcode()
-            self._extract_city()
-            self._remove_indices_after_zipcode()
-            self._extract_street_type()
-            self._extract_street_name()
-            self._extract_unit()
-            self._check_remaining_indices()
-        except InvalidAddressError:
-            pass
-        except IndexError:
-            self.error = "Invalid Address Format - Too short"
-            pass
+        if self.labels is None:
+            self.labels = vocabulary.label_tokens(self.tokens)
+        self._remaining = (1 << len(self.tokens)) - 1
+        profiler = profiling.active
+        if profiler is not None:
+            self._parse_profiled(profiler)
+            return
+        for stage in self._STAGES:
+            error = stage(self)
+            if error is not None:
+                self.error = error
+                return
+
+    # what _parse determines about the tokens, as stored in a ParseCache
+    _PARSE_RESULT = (
+        "labels",
+        "street_number_index",
+        "street_direction_index",
+        "street_name_range",
+        "street_type_index",
+        "unit_range",
+        "city_range",
+        "state_index",
+        "zipcode_index",
+        "zipcode_candidates",
+        "error",
+    )
+
+    def _parse_cached(self, cache):
+        # the same tokens parse differently when the zipcode may be inferred
+        key = (self.infer_zipcode, self.tokens)
+        result = cache.get(key)
+        if result is None:
+            self._parse()
+            self.labels = tuple(self.labels)
+            cache.put(key, tuple(getattr(self, name) for name in self._PARSE_RESULT))
+            return
+        for (name, value) in zip(self._PARSE_RESULT, result):
+            setattr(self, name, value)
+        profiler = profiling.active
+        if profiler is not None:
+            profiler.record_address(self)
+
+    def _parse_profiled(self, profiler):
+        for stage in self._STAGES:
+            error = profiler.run_stage(stage, self)
+            if error is not None:
+                self.error = error
+                break
+        profiler.record_address(self)
 
     @property
     def street_number(self):
@@ -136,35 +344,34 @@ class Address(object):
             return self.tokens[index]
 
     def _get_by_range(self, name):
-        ranged = getattr(self, name)
-        if isinstance(ranged, tuple):
-            low = ranged[0]
-            high = ranged[1]
-            if high == low:
-                return self.tokens[low]
-            else:
-                return " ".join(self.tokens[low:high])
+        return _join_range(self.tokens, getattr(self, name))
 
-    def _extract_state(self):
-        for index in range(len(self.tokens)):
-            if zipcode.is_state(self.tokens[index]):
-                self._remaining_indices.remove(index)
-                self.state_index = index
-                return
-        self.error = "State Not Found"
-        raise InvalidAddressError
+    def _remaining_before(self, limit):
+        remaining = self._remaining
+        return [i for i in range(limit) if remaining >> i & 1]
+
+    def _take(self, index):
+        self._remaining &= ~(1 << index)
+
+    def _take_range(self, start, stop):
+        self._remaining &= ~((1 << stop) - (1 << start))
 
     def _extract_street_number(self):
+        if len(self.tokens) == 0:
+            return TOO_SHORT
         if self.tokens[0].isnumeric():
             self.street_number_index = 0
-            self._remaining_indices.remove(0)
-            return
-        self.error = "Invalid Street Number"
-        raise InvalidAddressError
+            self._take(0)
+            return None
+        return "Invalid Street Number"
 
-    def _extract_street_type(self):
-        street_type_indices = self._index_of_street_type()
-        lowest_street_type_index = min(street_type_indices)
+    def _extract_state(self):
+        for index in range(len(self.tokens)):
+            if self.labels[index] & vocabulary.STATE:
+                self._take(index)
+                self.state_index = index
+                return None
+        return "State Not Found"
 
     def _extract_zipcode(self):
         """
@@ -172,101 +379,66 @@ class Address(object):
             - state_index
         """
         index = self.state_index + 1
-        token = self.tokens[index]
-        if zipcode.is_zipcode_5(token) or zipcode.is_zipcode_dashed(token):
-            self.zipcode_index = index
-            self._remaining_indices.remove(index)
-            return
-        self.error = "Zipcode Not Found"
-        raise InvalidAddressError
+        if index < len(self.tokens):
+            token = self.tokens[index]
+            if zipcode.is_zipcode_5(token) or zipcode.is_zipcode_dashed(token):
+                self.zipcode_index = index
+                self._take(index)
+                return None
+        if self.infer_zipcode:
+            # _extract_city looks the zipcodes up from the city and state
+            return None
+        if index >= len(self.tokens):
+            return TOO_SHORT
+        return "Zipcode Not Found"
 
     def _extract_city(self):
-        maybe_city = []
-        for index in reversed(self._remaining_indices):
-            if not index < self.state_index:
-                # not interested in things found after the state
+        """
+        Walks the tokens before the state through the trie of the city
+        names of the zipcode, so the shortest matching city wins. Without
+        a zipcode, the trie of every city of the state is walked and the
+        zipcodes of the city that matches become the candidates.
+        """
+        if self.zipcode_index is None:
+            city = self._match_city(zipcode.places().city_trie(self.state))
+            if city is None:
+                return "Invalid City/State Combo"
+            self.zipcode_candidates = zipcode.zipcodes_for(city, self.state)
+            return None
+        if self._match_city(zipcode.city_trie(self.zipcode, self.state)) is None:
+            return "Invalid City/State/Zipcode Combo"
+        return None
+
+    def _match_city(self, node):
+        remaining = self._remaining
+        for index in range(self.state_index - 1, -1, -1):
+            if node is None:
+                break
+            if not remaining >> index & 1:
                 continue
-            maybe_city = [self.tokens[index]] + maybe_city
-            #print("maybe_city", maybe_city, "with index", index)
-            # the 'st' of `st louis` is not in the zipcode info
-            # so we expand the abbreviation 'st' into 'saint'
-            city_parts = [cities.expand_abbreviation(p) for p in maybe_city]
-            city = " ".join(city_parts)
-            #print("city is", city)
-            is_city = zipcode.is_valid_place(city, self.state, self.zipcode)
-            if is_city:
+            # the trie also holds abbreviations like 'st' of `st louis`
+            node = node.get(self.tokens[index].lower())
+            if node is not None and cities.CITY_END in node:
                 self.city_range = (index, self.state_index)
-                inner_range = range(self.state_index - index)
-                for inner in [x+index for x in inner_range]:
-                    self._remaining_indices.remove(inner)
-                return
-        if not self.city_range:
-            self.error = "Invalid City/State/Zipcode Combo"
-            raise InvalidAddressError
+                self._take_range(index, self.state_index)
+                return node[cities.CITY_END]
+        return None
+
+    def _remove_indices_after_zipcode(self):
+        self._remaining &= (1 << (self.end_index + 1)) - 1
+        return None
 
-    def _extract_unit(self):
-        """
-        No error from this method because it is optional
-        depends_on:
-            - city_range
-            - street_type_index
-        """
-        start = self.street_type_index
-        stop = min(self.city_range)
-        unit_indices = []
-        has_a_unit_type = False
-        for index in reversed(self._remaining_indices):
-            if index > start and index < stop:
-                token = self.tokens[index]
-                if unit_type.is_unit_type(token):
-                    has_a_unit_type = True
-                unit_indices.append(index)
-        if has_a_unit_type or (len(unit_indices) == 1 and self.tokens[unit_indices[0]].isnumeric()):
-            for index in unit_indices:
-                self._remaining_indices.remove(index)
-            self.unit_range = (min(unit_indices), stop)
-    
-    
-    # def _extract_street_direction(self):
-    #     """
-    #     No error from this method because it is optional
-
-    #     depends on:
-    #         - street_number_index
-    #         - street_type_index
-    #     """
-    #     street_direction_index = self.street_number_index + 1
-    #     if (street_direction_index + 1) == self.street_type_index:
-    #         # if the street_type_index is the next index
-    #         # then the thing at street_direction_index is the
-    #         # street_name and not a direction no matter
-    #         # what it looks like
-    #         return
-    #     maybe_direction = self.tokens[street_direction_index]
-    #     if street_direction.is_direction(maybe_direction):
-    #         self.street_direction_index = street_direction_index
-    #         self._remaining_indices.remove(street_direction_index)
-    
     def _extract_street_type(self):
-        kept = []
-        # find all candidate street types
-        for index in self._remaining_indices:
-            if street_type.is_valid(self.tokens[index]):
-                kept.append(index)
-
-        # we want the first index that matches closest to the start of the city
-        # so we reverse the indices and then filter for only those
-        # indices that are before the city
+        # we want the street type that is closest to the start of the city
+        # and the street type must come before the city starts
         city_starts = min(self.city_range)
-        for index in reversed(kept):
-            if index >= city_starts:
-                # the street type must come before the city starts
-                continue
-            self.street_type_index = index
-            self._remaining_indices.remove(index)
-            return
-        self.error = "No Street Type"
-        raise InvalidAddressError
+        remaining = self._remaining
+        for index in range(city_starts - 1, -1, -1):
+            if remaining >> index & 1 and self.labels[index] & vocabulary.STREET_TYPE:
+                self.street_type_index = index
+                self._take(index)
+                return None
+        return "No Street Type"
 
     def _extract_street_name(self):
         """
@@ -274,60 +446,446 @@ class Address(object):
             - street_number_index
             - street_type_index
         """
-        limit = self.street_type_index
-        parts = [i for i in self._remaining_indices if i < limit]
+        parts = self._remaining_before(self.street_type_index)
         if len(parts) > 4:
-            self.errors = "Street name too long"
-            raise InvalidAddressError
+            return "Street name too long"
         if len(parts) == 0:
-            self.error = "No Street Name"
-            raise InvalidAddressError
-        for i in parts:
-            self._remaining_indices.remove(i)
+            return "No Street Name"
+        self._take_range(0, self.street_type_index)
         if len(parts) > 1:
             direction_index = parts[0]
-            direction_token = self.tokens[direction_index]
-            is_direction = street_direction.is_direction(direction_token)
-            if is_direction:
+            if self.labels[direction_index] & vocabulary.DIRECTION:
                 self.street_direction_index = direction_index
                 parts.remove(direction_index)
         self.street_name_range = (min(parts), self.street_type_index)
+        return None
+
+    def _extract_unit(self):
+        """
+        No error from this method because it is optional
+        depends_on:
+            - city_range
+            - street_type_index
+        """
+        start = self.street_type_index
+        stop = min(self.city_range)
+        unit_indices = [i for i in self._remaining_before(stop) if i > start]
+        has_a_unit_type = False
+        for index in unit_indices:
+            if self.labels[index] & vocabulary.UNIT_TYPE:
+                has_a_unit_type = True
+        if has_a_unit_type or (len(unit_indices) == 1 and self.tokens[unit_indices[0]].isnumeric()):
+            self._take_range(start + 1, stop)
+            self.unit_range = (min(unit_indices), stop)
+        return None
 
     def _check_remaining_indices(self):
-        if len(self._remaining_indices) > 0:
-            self.error = "Address has unidentified parts"
-            raise InvalidAddressError
-    
-    def _remove_indices_after_zipcode(self):
-        remaining = self._remaining_indices[:]
-        for index in remaining:
-            if index > self.zipcode_index:
-                self._remaining_indices.remove(index)
+        if self._remaining:
+            return "Address has unidentified parts"
+        return None
+
+    _STAGES = (
+        _extract_street_number,
+        _extract_state,
+        _extract_zipcode,
+        _extract_city,
+        _remove_indices_after_zipcode,
+        _extract_street_type,
+        _extract_street_name,
+        _extract_unit,
+        _check_remaining_indices,
+    )
+
+
+def _join_range(tokens, ranged):
+    # the tokens of a (low, high) range of an Address, or None
+    if isinstance(ranged, tuple):
+        (low, high) = ranged
+        if high == low:
+            return tokens[low]
+        return " ".join(tokens[low:high])
+
+class ValidAddress(namedtuple(
+        "ValidAddress", Address.FIELDS + ("start", "end", "zipcode_candidates"))):
+    """
+    The fields and offsets of a valid address, as returned by
+    extract_valid, and the `zipcode_candidates` of an address whose
+    zipcode was inferred (None for the others). Unlike Address it is immutable and has no __dict__,
+    so it is small and can be hashed, compared and pickled.
+    """
+    __slots__ = ()
 
-    
-def tokenize_text(text):
-    return [t for t in re.split("\s+", text) if len(t) > 0]
+    @property
+    def span(self):
+        if self.start is None:
+            return None
+        return (self.start, self.end)
+
+    def __str__(self):
+        parts = self[:len(Address.FIELDS)]
+        return " ".join([p for p in parts if p is not None])
+
+    def to_dict(self):
+        """
+        The fields and span as a dict, like Address.to_dict.
+        """
+        result = dict(zip(Address.FIELDS, self))
+        result["error"] = None
+        result["span"] = self.span
+        if self.zipcode_candidates is not None:
+            result["zipcode_candidates"] = list(self.zipcode_candidates)
+        return result
 
-def extract_all(text):
+def tokenize_text(text):
+    return TOKEN_PATTERN.findall(text)
+
+def tokenize_with_offsets(text, base=0):
+    """
+    Like tokenize_text, but also returns the (start, end) offsets of
+    each token, shifted by `base`.
+    """
+    matches = list(TOKEN_PATTERN.finditer(text))
+    tokens = list(map(methodcaller("group"), matches))
+    offsets = list(map(methodcaller("span"), matches))
+    if base:
+        offsets = [(base + start, base + end) for (start, end) in offsets]
+    return (tokens, offsets)
+
+def _state_positions(stripped, states, hash_mark):
+    """
+    The indices of the tokens that Address would take for a state, given
+    the tokens lowercased and stripped of punctuation.
+    """
+    positions = list(itertools.compress(
+        itertools.count(), map(states.__contains__, stripped)))
+    # Address._clean_tokens splits a leading "#" off into its own token
+    hashed = map(methodcaller("startswith", hash_mark), stripped)
+    for index in itertools.compress(itertools.count(), hashed):
+        if stripped[index].replace(hash_mark, hash_mark[:0]) in states:
+            positions.append(index)
+    return sorted(positions)
+
+def _is_zipcode_token(stripped):
+    if isinstance(stripped, bytes):
+        if len(stripped) not in (5, 10):
+            return False
+        stripped = stripped.decode("latin-1")
+    return zipcode.is_zipcode_5(stripped) or zipcode.is_zipcode_dashed(stripped)
+
+def _mark_viable(stripped, states, hash_mark, infer_zipcode=False):
+    """
+    Flags the indices at which a valid address could start.
+
+    Address._parse takes the first state in its window and requires a
+    zipcode right after it, so only the few tokens before a state that is
+    followed by a zipcode can start a valid address. When the zipcode may
+    be inferred, any state will do.
+    """
+    viable = bytearray(len(stripped))
+    previous_state = -1
+    for state in _state_positions(stripped, states, hash_mark):
+        after_state = state + 1
+        # the last token the window has to reach: the state itself when
+        # the zipcode may be inferred. A leading "#" would be split off
+        # into a token of its own, which _is_zipcode_token rejects as well
+        last = None
+        if infer_zipcode:
+            last = state
+        elif after_state < len(stripped) and _is_zipcode_token(stripped[after_state]):
+            last = after_state
+        if last is not None:
+            first = max(previous_state + 1, last - WINDOW_SIZE + 1)
+            viable[first:after_state] = b"\x01" * (after_state - first)
+        previous_state = state
+    return viable
+
+def _viable_byte_starts(tokens):
+    stripped = map(bytes.translate, tokens, itertools.repeat(None), itertools.repeat(b".,"))
+    states = set(state.encode("ascii") for state in zipcode.states())
+    return _mark_viable(list(map(bytes.lower, stripped)), states, b"#")
+
+def _scan(numeric, viable, stats, parse, valid_only=False):
+    """
+    Parses a window at each numeric token that is not part of an address
+    found before it. `numeric` flags the numeric tokens and `parse(start)`
+    makes the Address of the window starting at a token. With
+    `valid_only=True` invalid candidates are dropped as they are parsed.
+    """
     addresses = []
-    tokens = tokenize_text(text)
+    numeric = itertools.compress(itertools.count(), numeric)
     skip_to = 0
-    # print("tokens", tokens)
-    for (index, token) in enumerate(tokens):
-        # print("scanning token", index, token)
+    tried = 0
+    for index in numeric:
         if index < skip_to:
-            # print("skipping", index, token)
             continue
-        if token.isnumeric():
-            # print("found numeric", token)
-            address = Address(tokens[index:])
-            if address.is_valid:
-                skip_to = index + address.zipcode_index + 1
-                # print("updated skip_to", skip_to, "by", address)
-            else:
-                # print("invalid address", address.error, address.tokens)
-                pass
-            addresses.append(address)
+        if stats is not None:
+            stats.candidates += 1
+        if viable is not None and not viable[index]:
+            if stats is not None:
+                stats.pruned += 1
+            continue
+        address = parse(index)
+        tried += 1
+        if address.is_valid:
+            skip_to = index + address.end_index + 1
+        elif valid_only:
+            continue
+        addresses.append(address)
+    profiler = profiling.active
+    if profiler is not None:
+        accepted = sum(1 for address in addresses if address.is_valid)
+        profiler.record_document(tried, accepted)
     return addresses
 
-
+def extract_all(text, prefilter=False, stats=None, cache=None, infer_zipcode=False):
+    """
+    Extracts every candidate address from `text`, valid or not.
+
+    With `prefilter=True` candidates that cannot be valid are skipped
+    before parsing, so they are not returned. Pass a ScanStats as `stats`
+    to count the candidates that were seen and pruned, and a
+    cache.ParseCache as `cache` to reuse the parse of repeated windows.
+    With `infer_zipcode=True` addresses may end in a city and state
+    without a zipcode (see Address).
+    """
+    table = token_table.TokenTable(text)
+    viable = None
+    if prefilter:
+        # the lowercase tokens of the table are stripped of punctuation
+        viable = _mark_viable(table.lowered, zipcode.states(), "#", infer_zipcode)
+
+    def parse(start):
+        return Address.from_table(table, start, text, cache, infer_zipcode)
+
+    return _scan(table.numeric, viable, stats, parse)
+
+def extract_valid(text, as_tuples=False, stats=None, cache=None, infer_zipcode=False):
+    """
+    Extracts the valid addresses from `text` as ValidAddress tuples, or
+    as plain tuples of the same values with `as_tuples=True`.
+
+    Candidates that cannot be valid are skipped before parsing, as with
+    `prefilter=True` in extract_all, and invalid ones are dropped, so no
+    Address is kept. The arguments are those of extract_all.
+    """
+    table = token_table.TokenTable(text)
+    viable = _mark_viable(table.lowered, zipcode.states(), "#", infer_zipcode)
+
+    def parse(start):
+        return Address.from_table(table, start, text, cache, infer_zipcode)
+
+    addresses = _scan(table.numeric, viable, stats, parse, valid_only=True)
+    values = map(methodcaller("_values"), addresses)
+    if as_tuples:
+        return list(values)
+    return list(map(ValidAddress._make, values))
+
+def extract_all_bytes(buf, stats=None, encoding="utf-8", cache=None):
+    """
+    Extracts addresses from bytes, a bytearray, a memoryview or an mmap
+    holding utf-8 (or ascii) text, without decoding all of it.
+
+    Tokens are split on ascii whitespace and the prefilter of
+    extract_all runs on the raw bytes; only the windows that pass it
+    are decoded and parsed. Offsets are byte offsets and `source_text`
+    is a memoryview slice of `buf`, so an mmap cannot be closed while
+    the addresses are still referenced.
+    """
+    source = memoryview(buf).cast("B")
+    tokens = []
+    offsets = []
+    for match in BYTES_TOKEN_PATTERN.finditer(source):
+        tokens.append(match.group())
+        offsets.append(match.span())
+    viable = _viable_byte_starts(tokens)
+
+    def parse(start):
+        # only hand the parser the window it can use; slicing to the
+        # end of the document here makes extraction quadratic
+        stop = start + WINDOW_SIZE
+        window = [token.decode(encoding, "replace") for token in tokens[start:stop]]
+        return Address(window, offsets[start:stop], source, cache)
+
+    return _scan(map(bytes.isdigit, tokens), viable, stats, parse)
+
+def _iter_chunks(source):
+    if isinstance(source, str):
+        yield source
+    elif hasattr(source, "read"):
+        for chunk in iter(lambda: source.read(READ_SIZE), ""):
+            yield chunk
+    else:
+        for chunk in source:
+            yield chunk
+
+def _iter_tokens(chunks):
+    """
+    Tokenizes a stream of text chunks. The trailing token of a chunk
+    is held back until the next chunk arrives because it might continue
+    into it. Yields (token, (start, end)) pairs with offsets counted from
+    the start of the stream.
+    """
+    partial = ""
+    position = 0
+    for chunk in chunks:
+        text = partial + chunk
+        (tokens, offsets) = tokenize_with_offsets(text, position)
+        if tokens and not chunk[-1:].isspace():
+            partial = tokens.pop()
+            offsets.pop()
+        else:
+            partial = ""
+        position += len(text) - len(partial)
+        for pair in zip(tokens, offsets):
+            yield pair
+    if partial:
+        yield (partial, (position, position + len(partial)))
+
+def iter_extract(source, cache=None, infer_zipcode=False):
+    """
+    Lazily extracts addresses from a string, a file-like object or any
+    iterable of text chunks.
+
+    Only a window of WINDOW_SIZE tokens is held in memory at a time, so
+    memory use does not grow with the size of the input. Addresses that
+    are split across chunk boundaries are still found. The `span` of
+    each address is relative to the start of the stream.
+    """
+    window = deque()
+    skip = 0
+    tried = 0
+    accepted = 0
+
+    def scan():
+        nonlocal skip, tried, accepted
+        (token, _) = window[0]
+        if skip > 0:
+            skip -= 1
+        elif token.isnumeric():
+            (tokens, offsets) = zip(*window)
+            address = Address(tokens, offsets, cache=cache, infer_zipcode=infer_zipcode)
+            tried += 1
+            if address.is_valid:
+                accepted += 1
+                skip = address.end_index
+            return address
+
+    for pair in _iter_tokens(_iter_chunks(source)):
+        window.append(pair)
+        if len(window) == WINDOW_SIZE:
+            address = scan()
+            if address is not None:
+                yield address
+            window.popleft()
+    while window:
+        address = scan()
+        if address is not None:
+            yield address
+        window.popleft()
+    profiler = profiling.active
+    if profiler is not None:
+        profiler.record_document(tried, accepted)
+
+def _load_reference_data():
+    zipcode.index()
+    vocabulary.vocabulary()
+
+def _extract_chunk(numbered_texts):
+    return [(number, extract_all(text)) for (number, text) in numbered_texts]
+
+def _chunk_results(result):
+    # what Pool.apply_async hands to its callback or error_callback
+    if isinstance(result, BaseException):
+        raise result
+    return result
+
+def extract_many(documents, workers=None, chunksize=16, ordered=True):
+    """
+    Extracts addresses from an iterable of documents with a pool of
+    `workers` processes (default: one per cpu).
+
+    Yields the list of addresses of each document in the order of
+    `documents`. With `ordered=False` it yields `(position, addresses)`
+    pairs as soon as each document is done instead.
+
+    Documents are handed to the workers `chunksize` at a time and only a
+    few chunks per worker are read ahead of the results, so `documents`
+    can be a generator over a corpus that does not fit in memory. The
+    reference data is loaded before the pool starts so that forked
+    workers inherit it instead of loading it again.
+    """
+    # imported here to keep `import address_extractor` fast
+    import multiprocessing
+    import queue
+    _load_reference_data()
+    if workers is None:
+        workers = os.cpu_count() or 1
+    max_pending = workers * 4
+    numbered = enumerate(documents)
+    chunks = iter(lambda: list(itertools.islice(numbered, max(1, chunksize))), [])
+    with multiprocessing.Pool(workers, initializer=_load_reference_data) as pool:
+        if ordered:
+            pending = deque()
+            for chunk in chunks:
+                pending.append(pool.apply_async(_extract_chunk, (chunk,)))
+                if len(pending) >= max_pending:
+                    for (_, addresses) in pending.popleft().get():
+                        yield addresses
+            while pending:
+                for (_, addresses) in pending.popleft().get():
+                    yield addresses
+        else:
+            done = queue.SimpleQueue()
+            running = 0
+            for chunk in chunks:
+                pool.apply_async(
+                    _extract_chunk, (chunk,), callback=done.put, error_callback=done.put)
+                running += 1
+                if running >= max_pending:
+                    running -= 1
+                    yield from _chunk_results(done.get())
+            while running:
+                running -= 1
+                yield from _chunk_results(done.get())
+
+def extract_many_threaded(documents, workers=None, ordered=True, cache=None):
+    """
+    Like extract_many, but with a pool of `workers` threads (default: one
+    per cpu) instead of processes, and a cache.ParseCache that the
+    threads can share.
+
+    The parser keeps no state outside of the Address it is building and
+    the reference tables are never modified once loaded, so extraction is
+    safe from any number of threads. With the GIL the threads take turns;
+    on a free-threaded build of CPython they parse in parallel without
+    the cost of starting processes and pickling the results.
+
+    Only a few documents per worker are read ahead of the results.
+    """
+    from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
+    _load_reference_data()
+    if workers is None:
+        workers = os.cpu_count() or 1
+    max_pending = workers * 4
+    executor = ThreadPoolExecutor(workers)
+    try:
+        if ordered:
+            pending = deque()
+            for document in documents:
+                pending.append(executor.submit(extract_all, document, cache=cache))
+                if len(pending) >= max_pending:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        else:
+            positions = {}
+            for (position, document) in enumerate(documents):
+                positions[executor.submit(extract_all, document, cache=cache)] = position
+                if len(positions) >= max_pending:
+                    (done, _) = wait(positions, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield (positions.pop(future), future.result())
+            for future in as_completed(list(positions)):
+                yield (positions.pop(future), future.result())
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,132 @@
+"""
+asyncio front end for the extractor.
+
+Parsing is cpu-bound, so it runs in an executor (the loop's default thread
+pool unless a thread or process executor is given) instead of on the
+event loop.
+
+A line-protocol server is included for local load testing:
+
+    python -m address_extractor.aio [--host HOST] [--port PORT] [--processes N]
+
+Each line sent to it is treated as one document and is answered with one
+line holding a json list of the addresses found in it.
+"""
+import argparse
+import asyncio
+import functools
+import json
+from concurrent.futures import ProcessPoolExecutor
+
+import address_extractor
+
+DEFAULT_MAX_PENDING = 32
+
+async def extract_all(text, executor=None, **options):
+    """
+    Runs address_extractor.extract_all(text, **options) in `executor`.
+    """
+    loop = asyncio.get_running_loop()
+    call = functools.partial(address_extractor.extract_all, text, **options)
+    return await loop.run_in_executor(executor, call)
+
+async def _submit_all(documents, pending, executor, options):
+    loop = asyncio.get_running_loop()
+    try:
+        async for text in _aiter(documents):
+            call = functools.partial(address_extractor.extract_all, text, **options)
+            await pending.put(loop.run_in_executor(executor, call))
+    except asyncio.CancelledError:
+        # the consumer stopped and is no longer reading the queue
+        raise
+    except Exception:
+        # the consumer drains the queue, stops and awaits the error
+        await pending.put(None)
+        raise
+    await pending.put(None)
+
+async def _aiter(documents):
+    if hasattr(documents, "__aiter__"):
+        async for text in documents:
+            yield text
+    else:
+        for text in documents:
+            yield text
+
+async def extract_stream(documents, executor=None, max_pending=DEFAULT_MAX_PENDING, **options):
+    """
+    Yields the list of addresses of each document of an (async) iterable of
+    documents, in order.
+
+    At most `max_pending` documents are being parsed or waiting to be
+    consumed at a time; reading from `documents` pauses until the consumer
+    catches up.
+    """
+    pending = asyncio.Queue(maxsize=max_pending)
+    submitter = asyncio.ensure_future(_submit_all(documents, pending, executor, options))
+    try:
+        while True:
+            future = await pending.get()
+            if future is None:
+                break
+            yield await future
+        await submitter
+    finally:
+        submitter.cancel()
+        await asyncio.gather(submitter, return_exceptions=True)
+        # documents that were submitted but will not be consumed
+        while not pending.empty():
+            future = pending.get_nowait()
+            if future is not None:
+                future.cancel()
+
+async def _handle(reader, writer, executor, limit):
+    try:
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            async with limit:
+                addresses = await extract_all(line.decode("utf-8", "replace"), executor)
+            records = [address.to_dict() for address in addresses]
+            writer.write(json.dumps(records).encode("utf-8") + b"\n")
+            await writer.drain()
+    finally:
+        writer.close()
+
+async def start_server(host="127.0.0.1", port=8765, executor=None,
+                       max_pending=DEFAULT_MAX_PENDING):
+    """
+    Starts the line-protocol server and returns the asyncio.Server. No
+    more than `max_pending` lines are parsed at once across connections.
+    """
+    limit = asyncio.Semaphore(max_pending)
+    handler = functools.partial(_handle, executor=executor, limit=limit)
+    return await asyncio.start_server(handler, host, port)
+
+async def serve(host, port, executor, max_pending):
+    server = await start_server(host, port, executor, max_pending)
+    async with server:
+        await server.serve_forever()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="address extraction line server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--processes", type=int, default=0,
+                        help="parse in this many processes instead of threads")
+    parser.add_argument("--max-pending", type=int, default=DEFAULT_MAX_PENDING)
+    args = parser.parse_args(argv)
+    executor = None
+    if args.processes > 0:
+        executor = ProcessPoolExecutor(args.processes)
+    try:
+        asyncio.run(serve(args.host, args.port, executor, args.max_pending))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+if __name__ == "__main__":
+    main()
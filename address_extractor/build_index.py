@@ -0,0 +1,25 @@
+"""
+Rebuilds the precompiled zipcode index.
+
+Usage:
+
+    python -m address_extractor.build_index [csv_path] [index_path]
+
+By default the packaged us_zipcodes.csv is compiled into the packaged
+us_zipcodes.idx, which must be re-run whenever the csv changes.
+"""
+import sys
+
+from address_extractor import datafile, zipcode_index
+
+def main(argv):
+    if len(argv) > 0:
+        with open(argv[0], encoding="utf-8") as f:
+            lines = f.read().splitlines()
+    else:
+        lines = datafile.read_us_zipcodes()
+    path = argv[1] if len(argv) > 1 else zipcode_index.DEFAULT_PATH
+    zipcode_index.write(zipcode_index.build(lines), path)
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,68 @@
+"""
+A bounded cache of parse results for repeated candidate windows.
+
+Text that repeats the same addresses (email threads, listings, exports)
+yields the same cleaned token windows over and over. Passing a ParseCache
+to extract_all lets each repeat reuse the parse of the first one:
+
+    cache = ParseCache(maxsize=10000)
+    for text in documents:
+        extract_all(text, cache=cache)
+    cache.info()
+
+A cache can be shared between threads. Clear it after swapping the
+reference data with zipcode.load_index.
+"""
+import threading
+from collections import OrderedDict, namedtuple
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+EVICTION_POLICIES = ("lru", "fifo")
+
+class ParseCache(object):
+    """
+    Keeps at most `maxsize` results. With the "lru" eviction policy the
+    least recently used result is dropped first, with "fifo" the oldest.
+    """
+    def __init__(self, maxsize=4096, eviction="lru"):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        if eviction not in EVICTION_POLICIES:
+            raise ValueError("eviction must be one of {}".format(EVICTION_POLICIES))
+        self.maxsize = maxsize
+        self.eviction = eviction
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            result = self._entries.get(key)
+            if result is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                if self.eviction == "lru":
+                    self._entries.move_to_end(key)
+            return result
+
+    def put(self, key, result):
+        with self._lock:
+            self._entries[key] = result
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def info(self):
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self.maxsize, len(self._entries))
+
+    def __len__(self):
+        return len(self._entries)
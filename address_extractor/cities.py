@@ -1,9 +1,46 @@
-
+import itertools
+from functools import lru_cache
 
 CITY_ABBREVIATIONS = {
     "st": "saint",
     "mt": "mount",
 }
 
+# the key of the node of a city trie at which a complete city name ends,
+# holding the lowercase name of the city
+CITY_END = None
+
 def expand_abbreviation(token):
     return CITY_ABBREVIATIONS.get(token.lower()) or token
+
+def token_variants(part):
+    """
+    The lowercase tokens that expand_abbreviation accepts for one part of
+    a lowercase city name, e.g. "saint" and "st" for "saint".
+    """
+    variants = [abbr for (abbr, full) in CITY_ABBREVIATIONS.items() if full == part]
+    if part not in CITY_ABBREVIATIONS:
+        variants.append(part)
+    return variants
+
+def add_city(trie, city):
+    """
+    Adds the token sequences that spell `city` to a trie keyed by
+    lowercase tokens from the last token of the city backwards, so that a
+    city can be matched by walking away from the state that follows it.
+    """
+    city = city.lower()
+    parts = [token_variants(part) for part in reversed(city.split(" "))]
+    for tokens in itertools.product(*parts):
+        node = trie
+        for token in tokens:
+            node = node.setdefault(token, {})
+        node[CITY_END] = city
+    return trie
+
+@lru_cache(maxsize=None)
+def city_trie(city):
+    """
+    The trie (see add_city) of the token sequences that spell `city`.
+    """
+    return add_city({}, city)
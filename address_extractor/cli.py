@@ -0,0 +1,157 @@
+"""
+The address-extract command: extracts addresses from files, directories,
+glob patterns or stdin and writes one record per address as jsonl or csv.
+
+    address-extract [--format jsonl|csv] [--workers N] [PATH ...]
+
+Without paths (or with "-") stdin is read as a single document.
+"""
+import argparse
+import csv
+import glob
+import itertools
+import json
+import os
+import sys
+import time
+
+import address_extractor
+
+COLUMNS = ("path", "start", "end") + address_extractor.Address.FIELDS + ("error",)
+
+STDIN = "-"
+
+def iter_paths(patterns):
+    """
+    Expands files, directories (recursively) and glob patterns into file
+    paths. "-" is passed through for stdin.
+    """
+    for pattern in patterns:
+        if pattern == STDIN or os.path.isfile(pattern):
+            yield pattern
+        elif os.path.isdir(pattern):
+            for (root, dirs, files) in os.walk(pattern):
+                dirs.sort()
+                for name in sorted(files):
+                    yield os.path.join(root, name)
+        else:
+            matches = sorted(glob.glob(pattern, recursive=True))
+            if not matches:
+                raise FileNotFoundError("no files match {!r}".format(pattern))
+            for path in iter_paths(matches):
+                yield path
+
+def to_record(path, address):
+    record = address.to_dict()
+    (start, end) = record.pop("span") or (None, None)
+    record.update(path=path, start=start, end=end)
+    return dict((column, record[column]) for column in COLUMNS)
+
+def extract_records(path, text, prefilter=False, valid_only=False):
+    records = []
+    for address in address_extractor.extract_all(text, prefilter=prefilter):
+        if address.is_valid or not valid_only:
+            records.append(to_record(path, address))
+    return records
+
+def _extract_file(task):
+    (path, prefilter, valid_only) = task
+    with open(path, "rb") as f:
+        data = f.read()
+    text = data.decode("utf-8", "replace")
+    return (len(data), extract_records(path, text, prefilter, valid_only))
+
+def _read_stdin(prefilter, valid_only):
+    data = sys.stdin.buffer.read()
+    text = data.decode("utf-8", "replace")
+    return (len(data), extract_records(STDIN, text, prefilter, valid_only))
+
+class JsonlWriter(object):
+    def __init__(self, out):
+        self.out = out
+
+    def write(self, record):
+        self.out.write(json.dumps(record) + "\n")
+
+class CsvWriter(object):
+    def __init__(self, out):
+        self.writer = csv.DictWriter(out, COLUMNS)
+        self.writer.writeheader()
+
+    def write(self, record):
+        self.writer.writerow(record)
+
+WRITERS = {
+    "jsonl": JsonlWriter,
+    "csv": CsvWriter,
+}
+
+def _results(paths, args):
+    # None stands for stdin, which is read in this process between the
+    # files around it
+    tasks = [None if path == STDIN else (path, args.prefilter, args.valid_only) for path in paths]
+    if args.workers == 1 or sum(task is not None for task in tasks) < 2:
+        for task in tasks:
+            if task is None:
+                yield _read_stdin(args.prefilter, args.valid_only)
+            else:
+                yield _extract_file(task)
+        return
+    # imported here to keep the start of the command fast
+    import multiprocessing
+    address_extractor._load_reference_data()
+    with multiprocessing.Pool(args.workers) as pool:
+        for (is_stdin, group) in itertools.groupby(tasks, lambda task: task is None):
+            if is_stdin:
+                for _ in group:
+                    yield _read_stdin(args.prefilter, args.valid_only)
+            else:
+                for result in pool.imap(_extract_file, list(group), args.chunksize):
+                    yield result
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(
+        prog="address-extract",
+        description="Extract US street addresses from text files.")
+    parser.add_argument("paths", nargs="*", default=[STDIN],
+                        help="files, directories or glob patterns; '-' for stdin")
+    parser.add_argument("--format", choices=sorted(WRITERS), default="jsonl")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes (default: one per cpu)")
+    parser.add_argument("--chunksize", type=int, default=8,
+                        help="files handed to a worker at a time")
+    parser.add_argument("--valid-only", action="store_true",
+                        help="skip candidates that failed to parse")
+    parser.add_argument("--prefilter", action="store_true",
+                        help="skip candidates without a state and zipcode before parsing")
+    parser.add_argument("--quiet", action="store_true",
+                        help="do not report throughput on stderr")
+    return parser.parse_args(argv)
+
+def main(argv=None, out=None, err=None):
+    args = parse_args(argv)
+    out = out or sys.stdout
+    err = err or sys.stderr
+    writer = WRITERS[args.format](out)
+    documents = 0
+    size = 0
+    start = time.perf_counter()
+    try:
+        paths = list(iter_paths(args.paths))
+    except FileNotFoundError as e:
+        err.write("address-extract: {}\n".format(e))
+        return 2
+    for (document_size, records) in _results(paths, args):
+        documents += 1
+        size += document_size
+        for record in records:
+            writer.write(record)
+    elapsed = max(time.perf_counter() - start, 1e-9)
+    if not args.quiet:
+        mb = size / (1024 * 1024)
+        msg = "{} docs, {:.2f} MB in {:.2f}s ({:.1f} docs/s, {:.2f} MB/s)\n"
+        err.write(msg.format(documents, mb, elapsed, documents / elapsed, mb / elapsed))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,160 @@
+"""
+Extraction over columns of text kept in pandas or Arrow.
+
+    frame = extract_column(dataframe["notes"])           # pandas.DataFrame
+    table = extract_column(parquet_table["notes"])       # pyarrow.Table
+
+The result has one row per valid address: the position of the text it
+was found in (`row`), its `start`/`end` offsets in that text and the
+parsed fields of Address.FIELDS, which are null where an address has no
+such part. With `infer_zipcode=True` the `zipcode_candidates` of the
+addresses without a zipcode are given as lists of strings; the column is
+null for the others. Rows that are null are skipped.
+
+The addresses of a batch of rows are written straight into per-column
+buffers (integer arrays and lists of strings) that become one Arrow
+record batch each, instead of keeping an Address or a dict per address
+and converting those afterwards. pandas and pyarrow are optional
+dependencies (`pip install address_extractor[pandas]` or `[arrow]`).
+"""
+from array import array
+
+from address_extractor import Address, extract_all
+
+# how many addresses go into each record batch
+BATCH_SIZE = 64 * 1024
+
+COLUMNS = ("row", "start", "end") + Address.FIELDS + ("zipcode_candidates",)
+
+def _pyarrow():
+    try:
+        import pyarrow
+    except ImportError:
+        raise ImportError(
+            "Arrow output requires pyarrow: pip install address_extractor[arrow]")
+    return pyarrow
+
+def _pandas():
+    try:
+        import pandas
+    except ImportError:
+        raise ImportError(
+            "DataFrame output requires pandas: pip install address_extractor[pandas]")
+    return pandas
+
+def _is_pandas(values):
+    return type(values).__module__.split(".")[0] == "pandas"
+
+def _is_arrow(values):
+    return type(values).__module__.split(".")[0] == "pyarrow"
+
+class ColumnBuffers(object):
+    """
+    The columns of a batch of addresses: `row`, `start` and `end` as
+    int64 arrays, the fields as lists of strings and Nones and the
+    zipcode candidates as a list of lists of strings and Nones.
+    """
+    def __init__(self):
+        self.rows = array("q")
+        self.starts = array("q")
+        self.ends = array("q")
+        self.fields = [[] for _ in Address.FIELDS]
+        self.candidates = []
+
+    def __len__(self):
+        return len(self.rows)
+
+    def add(self, row, address):
+        (start, end) = address.span
+        self.rows.append(row)
+        self.starts.append(start)
+        self.ends.append(end)
+        for (column, name) in zip(self.fields, Address.FIELDS):
+            column.append(getattr(address, name))
+        candidates = address.zipcode_candidates
+        self.candidates.append(None if candidates is None else list(candidates))
+
+    def to_record_batch(self):
+        pa = _pyarrow()
+        integers = [
+            pa.Array.from_buffers(pa.int64(), len(self), [None, pa.py_buffer(column)])
+            for column in (self.rows, self.starts, self.ends)
+        ]
+        strings = [pa.array(column, type=pa.string()) for column in self.fields]
+        candidates = pa.array(self.candidates, type=pa.list_(pa.string()))
+        return pa.RecordBatch.from_arrays(
+            integers + strings + [candidates], names=list(COLUMNS))
+
+    def to_frame(self):
+        pd = _pandas()
+        # pandas depends on numpy
+        import numpy
+        columns = [
+            numpy.frombuffer(column, dtype=numpy.int64)
+            for column in (self.rows, self.starts, self.ends)
+        ]
+        columns += [pd.array(column, dtype="string") for column in self.fields]
+        columns.append(pd.Series(self.candidates, dtype=object))
+        return pd.DataFrame(dict(zip(COLUMNS, columns)))
+
+def _iter_texts(values):
+    """
+    The (row, text) of the non-null values of a pandas Series, a pyarrow
+    Array or ChunkedArray, or any iterable of strings and Nones.
+    """
+    if _is_pandas(values):
+        values = values.array
+    chunks = [values]
+    if _is_arrow(values) and hasattr(values, "chunks"):
+        chunks = values.chunks
+    row = 0
+    for chunk in chunks:
+        if _is_arrow(chunk):
+            chunk = chunk.to_pylist()
+        for text in chunk:
+            if isinstance(text, str):
+                yield (row, text)
+            row += 1
+
+def iter_buffers(values, batch_size=BATCH_SIZE, cache=None, infer_zipcode=False):
+    """
+    Yields the ColumnBuffers of the valid addresses in `values`, with at
+    most about `batch_size` addresses each.
+    """
+    buffers = ColumnBuffers()
+    for (row, text) in _iter_texts(values):
+        addresses = extract_all(text, prefilter=True, cache=cache, infer_zipcode=infer_zipcode)
+        for address in addresses:
+            if address.is_valid:
+                buffers.add(row, address)
+        if len(buffers) >= batch_size:
+            yield buffers
+            buffers = ColumnBuffers()
+    if len(buffers):
+        yield buffers
+
+def iter_record_batches(values, batch_size=BATCH_SIZE, cache=None, infer_zipcode=False):
+    """
+    Yields the valid addresses in `values` as pyarrow.RecordBatches, e.g.
+    for writing them to a Parquet file as they are found.
+    """
+    for buffers in iter_buffers(values, batch_size, cache, infer_zipcode):
+        yield buffers.to_record_batch()
+
+def extract_column(values, batch_size=BATCH_SIZE, cache=None, infer_zipcode=False):
+    """
+    Extracts the valid addresses of a column of text. A pandas Series
+    gives a pandas.DataFrame and anything else (a pyarrow Array or
+    ChunkedArray, or a list of strings) gives a pyarrow.Table. `row` is
+    the position of the text in `values`, not its index label.
+    """
+    if _is_pandas(values):
+        pd = _pandas()
+        frames = [
+            buffers.to_frame()
+            for buffers in iter_buffers(values, batch_size, cache, infer_zipcode)
+        ]
+        return pd.concat(frames or [ColumnBuffers().to_frame()], ignore_index=True)
+    pa = _pyarrow()
+    batches = list(iter_record_batches(values, batch_size, cache, infer_zipcode))
+    return pa.Table.from_batches(batches or [ColumnBuffers().to_record_batch()])
@@ -1,4 +1,4 @@
-import pkg_resources
+import pkgutil
 
 
 def read_us_zipcodes():
@@ -11,11 +11,10 @@ def read_street_types():
     return read_file_lines("data/street_types.txt")
 
 def read_file(filepath):
-    resource_package = __name__
-    with pkg_resources.resource_stream(resource_package, filepath) as r:
-        return r.read()
+    # pkgutil.get_data goes through the package's loader, so it works for
+    # zipped installs too, without the import cost of pkg_resources
+    return pkgutil.get_data(__package__, filepath)
 
 def read_file_lines(filepath):
-    resource_package = __name__
-    with pkg_resources.resource_stream(resource_package, filepath) as r:
-        return [line.decode("utf-8").strip() for line in r.readlines()]
+    text = read_file(filepath).decode("utf-8")
+    return [line.strip() for line in text.splitlines()]
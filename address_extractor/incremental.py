@@ -0,0 +1,147 @@
+"""
+Incremental extraction for documents that grow or change a little at a
+time, such as chat transcripts and log files.
+
+    extractor = IncrementalExtractor()
+    delta = extractor.append(new_lines)
+    delta = extractor.edit((start, end), replacement)
+    delta.added, delta.removed
+
+The extractor keeps the tokens of the document and the valid addresses
+found in it. An edit re-tokenizes only the tokens it touches and parses
+the windows that can see them, going past the edit only until the scan is
+back in step with the previous one. Afterwards `addresses` holds the valid
+addresses that extract_all would find in `text`.
+"""
+import bisect
+from collections import namedtuple
+
+import address_extractor
+from address_extractor import WINDOW_SIZE
+
+# the valid addresses that an edit added and removed
+Delta = namedtuple("Delta", ["added", "removed"])
+
+def _key(address):
+    return (address.span, repr(address), address.zipcode_candidates)
+
+class IncrementalExtractor(object):
+    """
+    `cache` and `infer_zipcode` are passed on to Address, as extract_all
+    does.
+    """
+    def __init__(self, text="", cache=None, infer_zipcode=False):
+        self.text = ""
+        self.cache = cache
+        self.infer_zipcode = infer_zipcode
+        self._tokens = []
+        self._starts = []
+        self._ends = []
+        self.addresses = []
+        # the index of the token that each address starts at
+        self._positions = []
+        if text:
+            self.append(text)
+
+    def append(self, text, stats=None):
+        """
+        Adds `text` to the end of the document and returns the Delta of
+        the valid addresses.
+        """
+        end = len(self.text)
+        return self.edit((end, end), text, stats)
+
+    def edit(self, span, text, stats=None):
+        """
+        Replaces the characters from span[0] to span[1] with `text` and
+        returns the Delta of the valid addresses. Pass a ScanStats as
+        `stats` to count the windows that were parsed again.
+        """
+        (start, end) = span
+        if not 0 <= start <= end <= len(self.text):
+            raise ValueError("{!r} is not a span of the text".format(span))
+        shift = len(text) - (end - start)
+        # the tokens that touch the edit, which may run into the new text
+        lo = bisect.bisect_left(self._ends, start)
+        hi = bisect.bisect_right(self._starts, end)
+        region_start = start
+        region_end = end
+        if hi > lo:
+            region_start = min(start, self._starts[lo])
+            region_end = max(end, self._ends[hi - 1])
+        self.text = self.text[:start] + text + self.text[end:]
+        (tokens, offsets) = address_extractor.tokenize_with_offsets(
+            self.text[region_start:region_end + shift], region_start)
+        self._tokens[lo:hi] = tokens
+        self._starts[lo:hi] = [token_start for (token_start, _) in offsets]
+        self._ends[lo:hi] = [token_end for (_, token_end) in offsets]
+        new_hi = lo + len(tokens)
+        if shift:
+            self._starts[new_hi:] = [offset + shift for offset in self._starts[new_hi:]]
+            self._ends[new_hi:] = [offset + shift for offset in self._ends[new_hi:]]
+        return self._rescan(lo, hi, new_hi, shift, stats)
+
+    def _parse(self, index):
+        stop = index + WINDOW_SIZE
+        offsets = list(zip(self._starts[index:stop], self._ends[index:stop]))
+        return address_extractor.Address(
+            self._tokens[index:stop], offsets, self.text, self.cache, self.infer_zipcode)
+
+    def _rescan(self, lo, hi, new_hi, shift, stats):
+        """
+        Scans again from the first window that can see the edited tokens,
+        which were lo to hi and are now lo to new_hi, like _scan of
+        extract_all.
+        """
+        token_shift = new_hi - hi
+        first = max(0, lo - WINDOW_SIZE + 1)
+        keep = bisect.bisect_left(self._positions, first)
+        skip_to = 0
+        if keep:
+            skip_to = self._positions[keep - 1] + self.addresses[keep - 1].end_index + 1
+        # the addresses of the previous scan from `first` on, by old position
+        old = list(zip(self._positions[keep:], self.addresses[keep:]))
+        for (position, address) in old:
+            address.source = self.text
+            if position >= hi and shift:
+                address.offsets = tuple((start + shift, end + shift) for (start, end) in address.offsets)
+        for address in self.addresses[:keep]:
+            address.source = self.text
+        found = []
+        # how far the previous scan skipped at the position matching index
+        consumed = 0
+        old_skip_to = skip_to
+        index = first
+        while index < len(self._tokens):
+            if index >= new_hi:
+                old_index = index - token_shift
+                while consumed < len(old) and old[consumed][0] < old_index:
+                    (position, address) = old[consumed]
+                    old_skip_to = position + address.end_index + 1
+                    consumed += 1
+                if max(skip_to, index) == max(old_skip_to + token_shift, index):
+                    # both scans go on the same way from here
+                    break
+            if index >= skip_to and self._tokens[index].isnumeric():
+                if stats is not None:
+                    stats.candidates += 1
+                address = self._parse(index)
+                if address.is_valid:
+                    found.append((index, address))
+                    skip_to = index + address.end_index + 1
+            index += 1
+        else:
+            consumed = len(old)
+        replaced = dict((_key(address), address) for (_, address) in old[:consumed])
+        added = []
+        for (number, (position, address)) in enumerate(found):
+            unchanged = replaced.pop(_key(address), None)
+            if unchanged is None:
+                added.append(address)
+            else:
+                found[number] = (position, unchanged)
+        tail = [(position + token_shift, address) for (position, address) in old[consumed:]]
+        scanned = found + tail
+        self._positions[keep:] = [position for (position, _) in scanned]
+        self.addresses[keep:] = [address for (_, address) in scanned]
+        return Delta(added, list(replaced.values()))
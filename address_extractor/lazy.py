@@ -0,0 +1,47 @@
+"""
+Loads reference tables on first use, once, even when several threads ask
+for them at the same time.
+
+functools.lru_cache does not promise that: threads that miss the cache at
+the same time each run the loader and get different objects back, which
+breaks the tables that are cached on the identity of another table (see
+vocabulary.vocabulary).
+"""
+import threading
+from collections import namedtuple
+from functools import wraps
+
+# the part of functools.lru_cache's cache_info that applies to a loader
+CacheInfo = namedtuple("CacheInfo", ["currsize"])
+
+def once(loader):
+    """
+    Decorates a loader without arguments so that it runs once and every
+    caller gets the same result. Like lru_cache, the decorated function
+    has a `cache_clear` to load the table again on the next call and a
+    `cache_info` that tells whether it is loaded.
+    """
+    lock = threading.Lock()
+    # the loaded table, or None
+    loaded = [None]
+
+    @wraps(loader)
+    def load():
+        table = loaded[0]
+        if table is None:
+            with lock:
+                table = loaded[0]
+                if table is None:
+                    table = loaded[0] = loader()
+        return table
+
+    def cache_clear():
+        with lock:
+            loaded[0] = None
+
+    def cache_info():
+        return CacheInfo(0 if loaded[0] is None else 1)
+
+    load.cache_clear = cache_clear
+    load.cache_info = cache_info
+    return load
@@ -0,0 +1,108 @@
+"""
+Opt-in instrumentation of the parser.
+
+    with profiling.profile() as profiler:
+        extract_all(text)
+    profiler.as_dict()
+
+While a Profiler is enabled it counts the calls and time of every stage
+of Address._parse, the errors that candidates were rejected with and the
+documents and candidates seen. Only totals are kept, so a profiler can
+stay enabled for any number of documents; the counts of each document
+are passed to the callback. When no profiler is enabled the parser only
+pays for checking `active`.
+
+A Profiler can record from several threads at once.
+"""
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+
+# the enabled Profiler, if any
+active = None
+
+class Profiler(object):
+    """
+    `callback(profiler, tried, accepted)` is called after each document,
+    e.g. to export the counters to a metrics system.
+    """
+    def __init__(self, callback=None):
+        self.callback = callback
+        self.stage_calls = Counter()
+        self.stage_seconds = defaultdict(float)
+        self.rejections = Counter()
+        self.candidates = 0
+        self.accepted = 0
+        # the documents recorded and the candidates tried in them
+        self.documents = 0
+        self.tried = 0
+        self._lock = threading.Lock()
+
+    def run_stage(self, stage, address):
+        start = time.perf_counter()
+        error = stage(address)
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            self.stage_seconds[stage.__name__] += elapsed
+            self.stage_calls[stage.__name__] += 1
+        return error
+
+    def record_address(self, address):
+        with self._lock:
+            self.candidates += 1
+            if address.error is None:
+                self.accepted += 1
+            else:
+                self.rejections[address.error] += 1
+
+    def record_document(self, tried, accepted):
+        with self._lock:
+            self.documents += 1
+            self.tried += tried
+        if self.callback is not None:
+            self.callback(self, tried, accepted)
+
+    def as_dict(self):
+        with self._lock:
+            return self._as_dict()
+
+    def _as_dict(self):
+        return {
+            "stages": dict(
+                (name, {"calls": calls, "seconds": self.stage_seconds[name]})
+                for (name, calls) in self.stage_calls.items()
+            ),
+            "rejections": dict(self.rejections),
+            "candidates": self.candidates,
+            "accepted": self.accepted,
+            "documents": self.documents,
+            "tried": self.tried,
+        }
+
+def enable(profiler=None, callback=None):
+    """
+    Starts recording into `profiler` (a new Profiler by default) and
+    returns it.
+    """
+    global active
+    active = profiler if profiler is not None else Profiler(callback)
+    return active
+
+def disable():
+    global active
+    profiler = active
+    active = None
+    return profiler
+
+@contextmanager
+def profile(profiler=None, callback=None):
+    previous = active
+    profiler = enable(profiler, callback)
+    try:
+        yield profiler
+    finally:
+        if previous is not None:
+            enable(previous)
+        else:
+            disable()
@@ -0,0 +1,180 @@
+"""
+Nearest-zipcode and radius queries over the coordinates of the zipcode
+index.
+
+    spatial.nearest_zipcodes(33.45, -112.07, k=3)
+    spatial.zipcodes_within(33.45, -112.07, radius_km=10)
+
+Both return (zipcode, distance_km) pairs, nearest first, with distances
+along the surface of the earth. The zipcodes are kept in a k-d tree of
+their positions on the unit sphere, where the straight-line (chord)
+distance between two points grows with their great-circle distance, so
+the searches are exact anywhere, including across the antimeridian. The
+tree is built the first time it is used.
+"""
+import heapq
+import math
+import threading
+from array import array
+
+from address_extractor import zipcode, zipcode_index
+
+EARTH_RADIUS_KM = 6371.0088
+
+# ranges of at most this many points are scanned instead of split further
+LEAF_SIZE = 8
+
+def to_unit_vector(latitude, longitude):
+    latitude = math.radians(latitude)
+    longitude = math.radians(longitude)
+    cos_latitude = math.cos(latitude)
+    return (
+        cos_latitude * math.cos(longitude),
+        cos_latitude * math.sin(longitude),
+        math.sin(latitude),
+    )
+
+def chord_to_km(chord):
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, chord / 2))
+
+def km_to_chord(km):
+    return 2 * math.sin(min(math.pi, km / EARTH_RADIUS_KM) / 2)
+
+def distance_km(latitude, longitude, other_latitude, other_longitude):
+    """
+    The great-circle distance between two points.
+    """
+    return chord_to_km(math.dist(
+        to_unit_vector(latitude, longitude),
+        to_unit_vector(other_latitude, other_longitude),
+    ))
+
+class ZipcodeTree(object):
+    """
+    A k-d tree over the zipcodes of a zipcode_index.ZipcodeIndex.
+
+    The tree is implicit: `points` and `rows` are ordered so that the
+    point splitting each range lo..hi sits at its middle, and the ranges
+    are split on the axes x, y and z in turn.
+    """
+    def __init__(self, index):
+        self.index = index
+        points = list(map(to_unit_vector, index.latitudes, index.longitudes))
+        order = list(range(len(points)))
+        ranges = [(0, len(order), 0)]
+        while ranges:
+            (lo, hi, axis) = ranges.pop()
+            if hi - lo <= LEAF_SIZE:
+                continue
+            order[lo:hi] = sorted(order[lo:hi], key=lambda row: points[row][axis])
+            mid = (lo + hi) // 2
+            ranges.append((lo, mid, (axis + 1) % 3))
+            ranges.append((mid + 1, hi, (axis + 1) % 3))
+        self.points = [points[row] for row in order]
+        self.rows = array("I", order)
+
+    def nearest(self, point, k):
+        """
+        The (squared chord distance, position) of the `k` points nearest
+        to `point`, nearest first.
+        """
+        points = self.points
+        # a max-heap of the best candidates so far, by negated distance
+        best = []
+        # (lo, hi, axis, squared distance to the range's splitting plane)
+        ranges = [(0, len(points), 0, 0.0)]
+        while ranges:
+            (lo, hi, axis, plane) = ranges.pop()
+            if len(best) == k and plane >= -best[0][0]:
+                continue
+            if hi - lo <= LEAF_SIZE:
+                candidates = range(lo, hi)
+            else:
+                mid = (lo + hi) // 2
+                candidates = (mid,)
+                offset = point[axis] - points[mid][axis]
+                below = (lo, mid, (axis + 1) % 3)
+                above = (mid + 1, hi, (axis + 1) % 3)
+                (near, far) = (below, above) if offset < 0 else (above, below)
+                ranges.append(far + (offset * offset,))
+                ranges.append(near + (0.0,))
+            for position in candidates:
+                (x, y, z) = points[position]
+                squared = (x - point[0]) ** 2 + (y - point[1]) ** 2 + (z - point[2]) ** 2
+                if len(best) < k:
+                    heapq.heappush(best, (-squared, position))
+                elif squared < -best[0][0]:
+                    heapq.heapreplace(best, (-squared, position))
+        return sorted((-negated, position) for (negated, position) in best)
+
+    def within(self, point, chord):
+        """
+        The (squared chord distance, position) of the points at most
+        `chord` away from `point`, nearest first.
+        """
+        points = self.points
+        limit = chord * chord
+        found = []
+        ranges = [(0, len(points), 0)]
+        while ranges:
+            (lo, hi, axis) = ranges.pop()
+            if hi - lo <= LEAF_SIZE:
+                candidates = range(lo, hi)
+            else:
+                mid = (lo + hi) // 2
+                candidates = (mid,)
+                offset = point[axis] - points[mid][axis]
+                if offset < 0 or offset * offset <= limit:
+                    ranges.append((lo, mid, (axis + 1) % 3))
+                if offset >= 0 or offset * offset <= limit:
+                    ranges.append((mid + 1, hi, (axis + 1) % 3))
+            for position in candidates:
+                (x, y, z) = points[position]
+                squared = (x - point[0]) ** 2 + (y - point[1]) ** 2 + (z - point[2]) ** 2
+                if squared <= limit:
+                    found.append((squared, position))
+        found.sort()
+        return found
+
+    def results(self, found):
+        return [
+            (zipcode_index.format_zipcode(self.index.zipcodes[self.rows[position]]),
+             chord_to_km(math.sqrt(squared)))
+            for (squared, position) in found
+        ]
+
+_tree = None
+_tree_lock = threading.Lock()
+
+def tree():
+    # rebuilt when zipcode.load_index swaps in a new index
+    global _tree
+    index = zipcode.index()
+    built = _tree
+    if built is None or built.index is not index:
+        with _tree_lock:
+            built = _tree
+            if built is None or built.index is not index:
+                built = _tree = ZipcodeTree(index)
+    return built
+
+def nearest_zipcodes(latitude, longitude, k=1):
+    """
+    The `k` zipcodes nearest to a point as (zipcode, distance_km) pairs,
+    nearest first.
+    """
+    if k <= 0:
+        return []
+    table = tree()
+    return table.results(table.nearest(to_unit_vector(latitude, longitude), k))
+
+def zipcodes_within(latitude, longitude, radius_km):
+    """
+    The zipcodes at most `radius_km` from a point as (zipcode,
+    distance_km) pairs, nearest first.
+    """
+    if radius_km < 0:
+        return []
+    table = tree()
+    chord = km_to_chord(radius_km)
+    return table.results(table.within(to_unit_vector(latitude, longitude), chord))
@@ -1,11 +1,17 @@
-
-from address_extractor import datafile
+from address_extractor import datafile, lazy
 
 def load_street_types():
         return set(line.strip().lower() for line in datafile.read_street_types())
 
-STREET_TYPES = load_street_types()
+@lazy.once
+def street_types():
+    return frozenset(load_street_types())
 
-def is_valid(token):
-    return token.lower() in STREET_TYPES
+def __getattr__(name):
+    # STREET_TYPES is loaded on first access instead of at import time
+    if name == "STREET_TYPES":
+        return street_types()
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
 
+def is_valid(token):
+    return token.lower() in street_types()
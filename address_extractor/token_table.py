@@ -0,0 +1,138 @@
+"""
+Tokenizes a document once for all of its candidate windows.
+
+Address cleans the tokens of its window by stripping "." and "," and
+splitting a leading "#" off into a token of its own, then labels them with
+the vocabulary. Consecutive windows overlap by up to WINDOW_SIZE - 1
+tokens, so doing that per window cleans and labels most tokens many
+times. A TokenTable cleans, lowercases and labels each token of a
+document at most once and hands out the slices that make up each window.
+
+Tokenizing and cleaning are done in bulk over the whole document.
+Vocabulary labels are only worked out for the tokens of the windows that
+are asked for, so the windows that the prefilter rules out cost next to
+nothing.
+"""
+import itertools
+import re
+from operator import methodcaller
+
+from address_extractor import vocabulary
+
+TOKEN_PATTERN = re.compile(r"\S+")
+
+# splits text into tokens and the whitespace between them
+SPLIT_PATTERN = re.compile(r"(\s+)")
+
+# the punctuation that Address strips from tokens
+PUNCTUATION = str.maketrans("", "", ".,")
+
+_is_hashed = methodcaller("startswith", "#")
+
+def split_hash(cleaned, start, end):
+    """
+    The tokens and offsets that Address parses in place of a cleaned token
+    that starts with "#", which becomes a token of its own.
+    """
+    return (("#", cleaned.replace("#", "")), ((start, start + 1), (start + 1, end)))
+
+class TokenTable(object):
+    """
+    The raw tokens of a document, whether each one is numeric (i.e. can
+    start an address) and the cleaned and lowercase form of each. The
+    vocabulary labels of the tokens are filled in by `window`.
+    """
+    def __init__(self, text, trie=None):
+        # tokens alternate with the whitespace between them, so the
+        # offsets of the tokens are the running lengths of the parts
+        parts = SPLIT_PATTERN.split(text)
+        bounds = list(itertools.accumulate(map(len, parts), initial=0))
+        first = 0 if parts[0] else 2
+        last = len(parts) if parts[-1] else len(parts) - 2
+        self.raw = parts[first:last:2]
+        self._starts = bounds[first:last:2]
+        self._ends = bounds[first + 1:last + 1:2]
+        self.numeric = list(map(str.isnumeric, self.raw))
+        # stripping the punctuation can only make tokens vanish, so the
+        # tokens of the stripped text line up when none did
+        self.cleaned = TOKEN_PATTERN.findall(text.translate(PUNCTUATION))
+        if len(self.cleaned) != len(self.raw):
+            self.cleaned = list(map(str.translate, self.raw, itertools.repeat(PUNCTUATION)))
+        self.lowered = list(map(str.lower, self.cleaned))
+        count = len(self.raw)
+        if "#" in text:
+            self._hashed = bytearray(map(_is_hashed, self.cleaned))
+        else:
+            self._hashed = bytearray(count)
+        self._labels = [0] * count
+        self._joins = bytearray(count + 1)
+        # the tokens from _stream_start to _labeled are labeled and
+        # _partial holds the entries in progress at _labeled
+        self._stream_start = 0
+        self._labeled = 0
+        self._partial = []
+        self._trie = vocabulary.vocabulary() if trie is None else trie
+
+    def __len__(self):
+        return len(self.raw)
+
+    def offsets(self, start, stop):
+        """
+        The (start, end) offsets of the raw tokens from `start` to `stop`.
+        """
+        return tuple(zip(self._starts[start:stop], self._ends[start:stop]))
+
+    def _label(self, start, stop):
+        if start > self._labeled or start < self._stream_start:
+            # nothing before start matters to this window
+            self._stream_start = self._labeled = start
+            self._partial = []
+        labels = self._labels
+        lowered = self.lowered
+        hashed = self._hashed
+        joins = self._joins
+        trie = self._trie
+        partial = self._partial
+        for index in range(self._labeled, stop):
+            if hashed[index]:
+                # windows with a "#" token are labeled on their own, so
+                # no entry needs to be followed across it
+                partial = []
+            elif partial or lowered[index] in trie:
+                partial = vocabulary.label_token(trie, labels, index, lowered[index], partial, joins)
+        self._partial = partial
+        self._labeled = max(self._labeled, stop)
+
+    def window(self, start, stop):
+        """
+        The cleaned tokens, labels and offsets of the window of raw tokens
+        from `start` to `stop`, exactly as Address would clean and label
+        the window on its own.
+        """
+        stop = min(stop, len(self.raw))
+        if self._hashed.find(1, start, stop) != -1:
+            return self._split_window(start, stop)
+        self._label(start, stop)
+        tokens = tuple(self.cleaned[start:stop])
+        joins = self._joins
+        if joins[start] or (stop < self._labeled and joins[stop]):
+            # an entry crosses the edge of the window, where the window on
+            # its own would not match it
+            labels = tuple(vocabulary.label_tokens(tokens, self._trie))
+        else:
+            labels = tuple(self._labels[start:stop])
+        return (tokens, labels, self.offsets(start, stop))
+
+    def _split_window(self, start, stop):
+        tokens = []
+        offsets = []
+        for (index, (token_start, token_end)) in enumerate(self.offsets(start, stop), start):
+            if self._hashed[index]:
+                (split, split_offsets) = split_hash(self.cleaned[index], token_start, token_end)
+                tokens.extend(split)
+                offsets.extend(split_offsets)
+            else:
+                tokens.append(self.cleaned[index])
+                offsets.append((token_start, token_end))
+        labels = tuple(vocabulary.label_tokens(tokens, self._trie))
+        return (tuple(tokens), labels, tuple(offsets))
@@ -1,6 +1,4 @@
-import re
-
-from address_extractor import datafile
+from address_extractor import datafile, lazy
 
 def load_unit_types():
     types = set()
@@ -11,7 +9,15 @@ def load_unit_types():
     extras = {"#", "number", "no", "no."}
     return types.union(extras)
 
-UNIT_TYPES = load_unit_types()
+@lazy.once
+def unit_types():
+    return frozenset(load_unit_types())
+
+def __getattr__(name):
+    # UNIT_TYPES is loaded on first access instead of at import time
+    if name == "UNIT_TYPES":
+        return unit_types()
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
 
 def is_unit_type(token):
-    return token.startswith("#") or token.lower() in UNIT_TYPES
+    return token.startswith("#") or token.lower() in unit_types()
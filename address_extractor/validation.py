@@ -0,0 +1,134 @@
+"""
+Vectorized validation of city, state and zipcode columns with NumPy.
+
+    result = validate_places(cities, states, zipcodes)
+    result.mask      # True where the row is a valid place
+    result.city      # canonical values of the valid rows, None elsewhere
+
+This answers the same question as zipcode.is_valid_place for every row at
+once, against arrays backed by the zipcode index. NumPy is an optional
+dependency (`pip install address_extractor[numpy]`).
+"""
+from collections import namedtuple
+
+from address_extractor import zipcode, zipcode_index
+
+PlaceValidation = namedtuple("PlaceValidation", ["mask", "city", "state", "zipcode"])
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError(
+            "validate_places requires numpy: pip install address_extractor[numpy]")
+    return numpy
+
+class ArrayTable(object):
+    """
+    The zipcode index as NumPy arrays. String columns hold ids of the
+    lowercased strings, so values compare the way is_valid_place does.
+    """
+    def __init__(self, index):
+        np = _numpy()
+        self.index = index
+        self.zipcodes = np.frombuffer(index.zipcodes, dtype=np.uint32)
+        self.strings = np.array([index.strings[i] for i in range(len(index.strings))], dtype=object)
+        self.lowered = {}
+        lower_ids = np.empty(len(self.strings), dtype=np.int64)
+        for (string_id, string) in enumerate(self.strings):
+            lower_ids[string_id] = self.lowered.setdefault(string.lower(), len(self.lowered))
+        self.city_ids = np.frombuffer(index.cities, dtype=np.uint32)
+        self.state_ids = np.frombuffer(index.states, dtype=np.uint32)
+        self.cities = lower_ids[self.city_ids]
+        self.states = lower_ids[self.state_ids]
+        self.state_names = lower_ids[np.frombuffer(index.state_names, dtype=np.uint32)]
+
+    def lower_ids(self, values):
+        """
+        The ids of the lowercased `values`, -1 for values not in the index.
+        """
+        np = _numpy()
+        values = np.asarray(values, dtype=str).ravel()
+        (unique, inverse) = np.unique(np.char.lower(values), return_inverse=True)
+        ids = np.array([self.lowered.get(value, -1) for value in unique.tolist()], dtype=np.int64)
+        return ids[inverse.ravel()]
+
+_table = None
+
+def array_table():
+    # rebuilt when zipcode.load_index swaps in a new index
+    global _table
+    index = zipcode.index()
+    table = _table
+    if table is None or table.index is not index:
+        table = _table = ArrayTable(index)
+    return table
+
+def zipcode_numbers(values):
+    """
+    Returns the zipcodes as ints and a mask of the well-formed ones. Like
+    is_valid_place, anything after a "-" is ignored.
+    """
+    np = _numpy()
+    values = np.asarray(values).ravel()
+    if len(values) == 0:
+        # np.char.partition fails on empty arrays
+        return (np.zeros(0, dtype=np.int64), np.zeros(0, dtype=bool))
+    if values.dtype.kind in "iu":
+        numbers = values.astype(np.int64)
+        return (numbers, (numbers >= 0) & (numbers <= 99999))
+    base = np.char.partition(values.astype(str), "-")[:, 0]
+    # ascii digits only, as ZipcodeIndex.find; np.char.isdecimal takes any
+    # unicode digit
+    codes = base.astype("U5").view(np.uint32).reshape(-1, 5)
+    digits = ((codes >= ord("0")) & (codes <= ord("9"))).all(axis=1)
+    ok = (np.char.str_len(base) == 5) & digits
+    numbers = np.zeros(len(base), dtype=np.int64)
+    numbers[ok] = base[ok].astype(np.int64)
+    return (numbers, ok)
+
+def validate_places(cities, states, zipcodes):
+    """
+    Validates rows of city, state (abbreviation or name) and zipcode
+    columns, given as lists or arrays of equal length.
+
+    Returns a PlaceValidation of the boolean mask of valid rows and the
+    canonical city, state abbreviation and 5 digit zipcode of each valid
+    row (None for invalid rows).
+    """
+    np = _numpy()
+    (numbers, ok) = zipcode_numbers(zipcodes)
+    count = len(numbers)
+    if count == 0:
+        if len(np.asarray(cities).ravel()) or len(np.asarray(states).ravel()):
+            raise ValueError("cities, states and zipcodes must have the same length")
+        return PlaceValidation(
+            np.zeros(0, dtype=bool),
+            np.empty(0, dtype=object),
+            np.empty(0, dtype=object),
+            np.empty(0, dtype=object),
+        )
+    table = array_table()
+    city_ids = table.lower_ids(cities)
+    state_ids = table.lower_ids(states)
+    if not (len(city_ids) == len(state_ids) == count):
+        raise ValueError("cities, states and zipcodes must have the same length")
+    if len(table.zipcodes) == 0:
+        rows = np.zeros(count, dtype=np.int64)
+        mask = np.zeros(count, dtype=bool)
+    else:
+        rows = np.minimum(np.searchsorted(table.zipcodes, numbers), len(table.zipcodes) - 1)
+        mask = (
+            ok
+            & (table.zipcodes[rows] == numbers)
+            & (table.cities[rows] == city_ids)
+            & ((table.states[rows] == state_ids) | (table.state_names[rows] == state_ids))
+        )
+    valid_rows = rows[mask]
+    city = np.full(count, None, dtype=object)
+    city[mask] = table.strings[table.city_ids[valid_rows]]
+    state = np.full(count, None, dtype=object)
+    state[mask] = table.strings[table.state_ids[valid_rows]]
+    canonical_zipcode = np.full(count, None, dtype=object)
+    canonical_zipcode[mask] = [zipcode_index.format_zipcode(number) for number in numbers[mask].tolist()]
+    return PlaceValidation(mask, city, state, canonical_zipcode)
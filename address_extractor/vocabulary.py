@@ -0,0 +1,109 @@
+"""
+Labels tokens with the classes of vocabulary they belong to.
+
+States, street types, unit types and street directions are compiled into
+one trie of lowercase token sequences, so a stream of tokens is labeled in
+a single pass and entries that span several tokens can be matched too.
+Each label is a bitmask of the classes below.
+
+The trie is never modified once it is built, so threads can share it.
+"""
+import threading
+
+from address_extractor import (
+    street_direction,
+    street_type,
+    unit_type,
+    zipcode,
+)
+
+STATE = 1
+STREET_TYPE = 2
+UNIT_TYPE = 4
+DIRECTION = 8
+
+# the key of a trie node that holds the classes of the entry ending there
+CLASSES = None
+
+def add_entry(trie, entry, classes):
+    node = trie
+    for token in entry.lower().split():
+        node = node.setdefault(token, {})
+    node[CLASSES] = node.get(CLASSES, 0) | classes
+
+def build_vocabulary(states):
+    trie = {}
+    for state in states:
+        add_entry(trie, state, STATE)
+    for name in street_type.street_types():
+        add_entry(trie, name, STREET_TYPE)
+    for name in unit_type.unit_types():
+        add_entry(trie, name, UNIT_TYPE)
+    for direction in street_direction.DIRECTIONS:
+        add_entry(trie, direction, DIRECTION)
+    return trie
+
+# the states the trie was built for and the trie
+_vocabulary = (None, None)
+_vocabulary_lock = threading.Lock()
+
+def vocabulary():
+    # rebuilt when zipcode.load_index swaps in a new set of states
+    global _vocabulary
+    states = zipcode.states()
+    (built_for, trie) = _vocabulary
+    if built_for is not states:
+        with _vocabulary_lock:
+            (built_for, trie) = _vocabulary
+            if built_for is not states:
+                trie = build_vocabulary(states)
+                _vocabulary = (states, trie)
+    return trie
+
+def _has_next(node):
+    return len(node) > (CLASSES in node)
+
+def label_token(trie, labels, index, lowered, partial, joins=None):
+    """
+    Labels the lowercase token at `index` given the longer entries matched
+    up to the previous token, as (start, node) pairs in `partial`, and
+    returns the entries still in progress after it. When `joins` is given,
+    every token but the first of a matched multi-token entry is flagged in
+    it, i.e. joins[i] tells whether an entry spans tokens i - 1 and i.
+    """
+    if lowered.startswith("#"):
+        labels[index] |= UNIT_TYPE
+    if partial:
+        matched = []
+        for (start, node) in partial:
+            node = node.get(lowered)
+            if node is None:
+                continue
+            classes = node.get(CLASSES)
+            if classes:
+                for covered in range(start, index + 1):
+                    labels[covered] |= classes
+                if joins is not None:
+                    joins[start + 1:index + 1] = b"\x01" * (index - start)
+            if _has_next(node):
+                matched.append((start, node))
+        partial = matched
+    node = trie.get(lowered)
+    if node is not None:
+        labels[index] |= node.get(CLASSES, 0)
+        if _has_next(node):
+            partial.append((index, node))
+    return partial
+
+def label_tokens(tokens, trie=None):
+    """
+    Returns the class bitmask of every token. A token gets the classes of
+    every entry it is part of; tokens starting with "#" are unit types.
+    """
+    if trie is None:
+        trie = vocabulary()
+    labels = [0] * len(tokens)
+    partial = []
+    for (index, token) in enumerate(tokens):
+        partial = label_token(trie, labels, index, token.lower(), partial)
+    return labels
@@ -1,7 +1,21 @@
+import sys
+import threading
+from array import array
+from collections.abc import Mapping, Set
 
-from address_extractor import datafile
+from address_extractor import cities, datafile, lazy, zipcode_index
 
 class ZipcodeInfo(object):
+    __slots__ = (
+        "zipcode",
+        "city",
+        "state_name",
+        "state",
+        "county",
+        "latitude",
+        "longitude",
+    )
+
     @staticmethod
     def from_line(line):
         # 'zipcode,city,state_name,state,county,latitude,longitude\n'
@@ -10,22 +24,131 @@ class ZipcodeInfo(object):
     def __init__(self, zipcode, city, state_name,
                  state, county, latitude, longitude):
         self.zipcode = zipcode
-        self.city = city.lower()
-        self.state_name = state_name.lower()
-        self.state = state.lower()
-        self.county = county.lower()
+        self.city = sys.intern(city.lower())
+        self.state_name = sys.intern(state_name.lower())
+        self.state = sys.intern(state.lower())
+        self.county = sys.intern(county.lower())
         self.latitude = float(latitude)
         self.longitude = float(longitude)
     
     def matches(self, city, state, zipcode):
         return (
-            state.lower() in [self.state, self.state_name]
+            state.lower() in (self.state, self.state_name)
             and self.city == city.lower()
             and self.zipcode == zipcode
         )
 
 
+class ZipcodeInfoMap(Mapping):
+    """
+    A read-only zipcode -> ZipcodeInfo mapping over the zipcode index.
+    The ZipcodeInfo for a zipcode is only created when it is looked up.
+    """
+    def __init__(self, index):
+        self._index = index
+
+    def __getitem__(self, zipcode):
+        info = self.get(zipcode)
+        if info is None:
+            raise KeyError(zipcode)
+        return info
+
+    def get(self, zipcode, default=None):
+        row = self._index.find(zipcode) if isinstance(zipcode, str) else None
+        if row is None:
+            return default
+        return ZipcodeInfo(*self._index.row(row))
+
+    def __iter__(self):
+        return iter(self._index)
+
+    def __len__(self):
+        return len(self._index)
+
+class ZipcodeSet(Set):
+    """
+    A read-only set of the 5 digit zipcodes in the zipcode index.
+    """
+    def __init__(self, index):
+        self._index = index
+
+    def __contains__(self, zipcode):
+        return isinstance(zipcode, str) and self._index.find(zipcode) is not None
+
+    def __iter__(self):
+        return iter(self._index)
+
+    def __len__(self):
+        return len(self._index)
+
+class PlaceIndex(object):
+    """
+    Reverse indexes of the zipcode index: the zipcodes of each (city,
+    state) and the cities of each state. The zipcodes of all places are
+    stored back to back in one array, sorted by place, and each place
+    maps to its range of it.
+
+    Cities and states are matched in lowercase and a state can be given
+    by its abbreviation or its name.
+    """
+    def __init__(self, index):
+        lowered = [index.strings[i].lower() for i in range(len(index.strings))]
+        places = {}
+        self._abbreviations = {}
+        for (row, (city, state, state_name)) in enumerate(
+                zip(index.cities, index.states, index.state_names)):
+            places.setdefault((lowered[city], lowered[state]), []).append(row)
+            self._abbreviations[lowered[state_name]] = lowered[state]
+            self._abbreviations[lowered[state]] = lowered[state]
+        self._zipcodes = array("I")
+        # (city, state) -> (start, stop) in _zipcodes
+        self._places = {}
+        self._cities = {}
+        for (place, rows) in sorted(places.items()):
+            start = len(self._zipcodes)
+            self._zipcodes.extend(index.zipcodes[row] for row in rows)
+            self._places[place] = (start, len(self._zipcodes))
+            self._cities.setdefault(place[1], []).append(place[0])
+        self._city_tries = {}
+        self._lock = threading.Lock()
+
+    def state_abbreviation(self, state):
+        """
+        The lowercase abbreviation of a state name or abbreviation, or None.
+        """
+        return self._abbreviations.get(state.lower())
+
+    def zipcodes(self, city, state):
+        """
+        The 5 digit zipcodes of a city, in order.
+        """
+        place = self._places.get((city.lower(), self.state_abbreviation(state)))
+        if place is None:
+            return ()
+        return tuple(map(zipcode_index.format_zipcode, self._zipcodes[place[0]:place[1]]))
+
+    def cities(self, state):
+        """
+        The lowercase names of the cities of a state, in order.
+        """
+        return tuple(self._cities.get(self.state_abbreviation(state), ()))
 
+    def city_trie(self, state):
+        """
+        A trie (see cities.add_city) of all the cities of a state, built
+        the first time it is asked for.
+        """
+        state = self.state_abbreviation(state)
+        trie = self._city_tries.get(state)
+        if trie is None:
+            with self._lock:
+                trie = self._city_tries.get(state)
+                if trie is None:
+                    trie = {}
+                    for city in self._cities.get(state, ()):
+                        cities.add_city(trie, city)
+                    self._city_tries[state] = trie
+        return trie
 
 def load_zipcodes():
     zipcodes = {}
@@ -34,10 +157,6 @@ def load_zipcodes():
         zipcodes[zip_info.zipcode] = zip_info
     return zipcodes
 
-ZIPCODE_INFOS = load_zipcodes()
-
-ZIPCODES = set(ZIPCODE_INFOS.keys())
-
 def load_states(zipcode_infos):
     states = set()
     for zipcode_info in zipcode_infos.values():
@@ -45,18 +164,118 @@ def load_states(zipcode_infos):
         states.add(zipcode_info.state)
     return states
 
-STATES = load_states(ZIPCODE_INFOS)
+# The reference tables are only loaded the first time they are used so
+# that importing the package stays cheap. They are all derived from the
+# precompiled zipcode index (see zipcode_index.py). Once loaded they are
+# never modified, so any number of threads can read them at once.
+
+_index = None
+_index_lock = threading.Lock()
+
+def index():
+    global _index
+    table = _index
+    if table is None:
+        with _index_lock:
+            if _index is None:
+                _index = zipcode_index.load_default()
+            table = _index
+    return table
+
+def load_index(path):
+    """
+    Replaces the zipcode table with a precompiled index file, e.g. one
+    built from an updated dataset with
+    `python -m address_extractor.build_index csv_path index_path`.
+    Swap the table before extracting from other threads, not while they
+    are extracting.
+    """
+    global _index
+    table = zipcode_index.load(path)
+    with _index_lock:
+        _index = table
+        for loader in _LAZY_TABLES.values():
+            loader.cache_clear()
+    return table
+
+@lazy.once
+def zipcode_infos():
+    return ZipcodeInfoMap(index())
+
+@lazy.once
+def zipcodes():
+    return ZipcodeSet(index())
+
+@lazy.once
+def places():
+    return PlaceIndex(index())
+
+@lazy.once
+def states():
+    table = index()
+    return frozenset(table.strings[i].lower() for i in set(table.states))
+
+_LAZY_TABLES = {
+    "ZIPCODE_INFOS": zipcode_infos,
+    "ZIPCODES": zipcodes,
+    "STATES": states,
+    "PLACES": places,
+}
+
+def __getattr__(name):
+    loader = _LAZY_TABLES.get(name)
+    if loader is None:
+        raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+    return loader()
 
 def is_state(token):
-    return token.lower() in STATES
+    return token.lower() in states()
 
 def is_valid_place(city, state, zipcode):
     zipcode = zipcode.split("-")[0]
-    found = ZIPCODE_INFOS.get(zipcode)
+    found = by_number(zipcode)
     return bool(found) and found.matches(city, state, zipcode)
 
+def city_trie(zipcode, state):
+    """
+    The trie of the city names (see cities.city_trie) that are a valid
+    place together with `state` and `zipcode`, or None when the state and
+    zipcode do not go together.
+    """
+    table = index()
+    row = table.find(zipcode.split("-")[0])
+    if row is None:
+        return None
+    state = state.lower()
+    if (state != table.strings[table.states[row]].lower()
+            and state != table.strings[table.state_names[row]].lower()):
+        return None
+    return cities.city_trie(table.strings[table.cities[row]])
+
+def coordinates(zipcode):
+    """
+    The (latitude, longitude) of a 5 digit or dashed zipcode, or None.
+    """
+    table = index()
+    row = table.find(zipcode.split("-")[0])
+    if row is None:
+        return None
+    return (table.latitudes[row], table.longitudes[row])
+
+def zipcodes_for(city, state):
+    """
+    The 5 digit zipcodes of a city in a state (abbreviation or name).
+    """
+    return places().zipcodes(city, state)
+
+def cities_of(state):
+    """
+    The lowercase names of the cities of a state (abbreviation or name).
+    """
+    return places().cities(state)
+
 def is_zipcode_5(token):
-    return token in ZIPCODES
+    return index().find(token) is not None
 
 def is_zipcode_dashed(token):
     return (
@@ -68,4 +287,4 @@ def is_zipcode_dashed(token):
     )
 
 def by_number(number):
-    return ZIPCODE_INFOS.get(number)
+    return zipcode_infos().get(number)
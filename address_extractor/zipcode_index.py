@@ -0,0 +1,229 @@
+"""
+A compact, precompiled form of the zipcode table.
+
+The index is a sorted column of zipcodes (as ints) alongside columns of
+string ids for the city, state name, state and county of each zipcode and
+columns of coordinates. Strings are stored once in a shared string table.
+
+On disk every column is a little-endian array that is memory-mapped at
+load time, so nothing is parsed up front and processes that load the same
+file share its pages through the OS page cache.
+
+The index is rebuilt from a csv with `python -m address_extractor.build_index`.
+"""
+import mmap
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+
+from address_extractor import datafile
+
+MAGIC = b"AEZIDX01"
+
+# magic, number of zipcodes, number of strings, size of the string blob
+HEADER = struct.Struct("<8sIII4x")
+
+STRING_COLUMNS = ("cities", "state_names", "states", "counties")
+
+DEFAULT_PATH = os.path.join(os.path.dirname(__file__), "data", "us_zipcodes.idx")
+
+
+class InvalidIndexError(Exception):
+    pass
+
+
+class StringTable(object):
+    """
+    Strings stored back to back in one utf-8 blob and decoded on access.
+    """
+    def __init__(self, offsets, blob):
+        self.offsets = offsets
+        self.blob = blob
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, string_id):
+        start = self.offsets[string_id]
+        stop = self.offsets[string_id + 1]
+        return str(self.blob[start:stop], "utf-8")
+
+
+class ZipcodeIndex(object):
+    def __init__(self, zipcodes, cities, state_names, states, counties,
+                 latitudes, longitudes, strings):
+        self.zipcodes = zipcodes
+        self.cities = cities
+        self.state_names = state_names
+        self.states = states
+        self.counties = counties
+        self.latitudes = latitudes
+        self.longitudes = longitudes
+        self.strings = strings
+
+    def __len__(self):
+        return len(self.zipcodes)
+
+    def __contains__(self, zipcode):
+        return self.find(zipcode) is not None
+
+    def __iter__(self):
+        for number in self.zipcodes:
+            yield format_zipcode(number)
+
+    def find(self, zipcode):
+        """
+        Returns the row of a 5 digit zipcode string or None.
+        """
+        if len(zipcode) != 5 or not (zipcode.isascii() and zipcode.isdigit()):
+            return None
+        number = int(zipcode)
+        row = bisect_left(self.zipcodes, number)
+        if row < len(self.zipcodes) and self.zipcodes[row] == number:
+            return row
+        return None
+
+    def row(self, row):
+        """
+        Returns the fields of a row in the order of the csv columns.
+        """
+        return (
+            format_zipcode(self.zipcodes[row]),
+            self.strings[self.cities[row]],
+            self.strings[self.state_names[row]],
+            self.strings[self.states[row]],
+            self.strings[self.counties[row]],
+            self.latitudes[row],
+            self.longitudes[row],
+        )
+
+
+def format_zipcode(number):
+    return "{:05d}".format(number)
+
+def build(lines):
+    """
+    Builds an in-memory index from the lines of a zipcode csv, header
+    included.
+    """
+    rows = sorted(line.strip().split(",") for line in lines[1:] if line.strip())
+    string_ids = {}
+    strings = []
+
+    def intern(value):
+        string_id = string_ids.get(value)
+        if string_id is None:
+            string_id = string_ids[value] = len(strings)
+            strings.append(value)
+        return string_id
+
+    zipcodes = array("I")
+    columns = dict((name, array("I")) for name in STRING_COLUMNS)
+    latitudes = array("d")
+    longitudes = array("d")
+    for (zipcode, city, state_name, state, county, latitude, longitude) in rows:
+        if zipcodes and zipcodes[-1] == int(zipcode):
+            # keep the last row of a duplicated zipcode, like a dict would
+            for column in columns.values():
+                column.pop()
+            zipcodes.pop()
+            latitudes.pop()
+            longitudes.pop()
+        zipcodes.append(int(zipcode))
+        columns["cities"].append(intern(city))
+        columns["state_names"].append(intern(state_name))
+        columns["states"].append(intern(state))
+        columns["counties"].append(intern(county))
+        latitudes.append(float(latitude))
+        longitudes.append(float(longitude))
+    return ZipcodeIndex(
+        zipcodes,
+        columns["cities"],
+        columns["state_names"],
+        columns["states"],
+        columns["counties"],
+        latitudes,
+        longitudes,
+        strings,
+    )
+
+def _sections(index):
+    blob = bytearray()
+    offsets = array("I", [0])
+    for i in range(len(index.strings)):
+        blob += index.strings[i].encode("utf-8")
+        offsets.append(len(blob))
+    return [
+        array("I", index.zipcodes),
+        array("I", index.cities),
+        array("I", index.state_names),
+        array("I", index.states),
+        array("I", index.counties),
+        array("d", index.latitudes),
+        array("d", index.longitudes),
+        offsets,
+        bytes(blob),
+    ]
+
+def _padding(size):
+    return b"\0" * (-size % 8)
+
+def write(index, path):
+    sections = _sections(index)
+    blob = sections[-1]
+    with open(path, "wb") as f:
+        header = HEADER.pack(MAGIC, len(index), len(index.strings), len(blob))
+        f.write(header)
+        for section in sections:
+            if isinstance(section, array):
+                if sys.byteorder != "little":
+                    section.byteswap()
+                section = section.tobytes()
+            f.write(section)
+            f.write(_padding(len(section)))
+
+def _column(buf, offset, typecode, count):
+    size = array(typecode).itemsize * count
+    if offset + size > len(buf):
+        raise InvalidIndexError("zipcode index is truncated")
+    view = buf[offset:offset + size]
+    if sys.byteorder == "little":
+        column = view.cast(typecode)
+    else:
+        column = array(typecode, view.tobytes())
+        column.byteswap()
+    return column, offset + size + len(_padding(size))
+
+def load(path):
+    """
+    Memory-maps a precompiled index written by `write`.
+    """
+    with open(path, "rb") as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    buf = memoryview(mapped)
+    if len(buf) < HEADER.size:
+        raise InvalidIndexError("{} is too short to be a zipcode index".format(path))
+    magic, count, string_count, blob_size = HEADER.unpack_from(buf)
+    if magic != MAGIC:
+        raise InvalidIndexError("{} is not a zipcode index".format(path))
+    offset = HEADER.size
+    columns = []
+    for typecode in "IIIIIdd":
+        column, offset = _column(buf, offset, typecode, count)
+        columns.append(column)
+    offsets, offset = _column(buf, offset, "I", string_count + 1)
+    if offset + blob_size > len(buf):
+        raise InvalidIndexError("zipcode index is truncated")
+    blob = buf[offset:offset + blob_size]
+    return ZipcodeIndex(*columns, strings=StringTable(offsets, blob))
+
+def load_default():
+    """
+    Loads the packaged index, falling back to the packaged csv when the
+    index is not available as a real file (e.g. a zipped install).
+    """
+    if os.path.isfile(DEFAULT_PATH):
+        return load(DEFAULT_PATH)
+    return build(datafile.read_us_zipcodes())
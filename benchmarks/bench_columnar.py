@@ -0,0 +1,49 @@
+"""
+Compares extract_column on a pandas Series with the row-by-row
+`.apply(extract_all)` it replaces, which builds a DataFrame from one dict
+per address. Requires pandas and pyarrow.
+
+Usage:
+
+    python -m benchmarks.bench_columnar [rows]
+"""
+import sys
+import time
+
+import pandas
+import pyarrow
+
+from address_extractor import extract_all
+from address_extractor.columnar import extract_column
+from benchmarks.corpus import CorpusGenerator
+
+def with_apply(series):
+    records = []
+    for (row, addresses) in enumerate(series.apply(extract_all)):
+        for address in addresses:
+            if address.is_valid:
+                (start, end) = address.span
+                records.append(dict(address.to_dict(), row=row, start=start, end=end))
+    return pandas.DataFrame.from_records(records)
+
+def timed(function, values):
+    start = time.perf_counter()
+    result = function(values)
+    return (time.perf_counter() - start, len(result))
+
+def run(count):
+    texts = CorpusGenerator(seed=0, address_density=0.05).documents(count, 300)
+    series = pandas.Series(texts)
+    (baseline, found) = timed(with_apply, series)
+    print("{} rows, {} addresses".format(count, found))
+    print("{:<28} {:>10.1f} ms".format(".apply(extract_all)", baseline * 1000))
+    for (name, function, values) in [
+        ("extract_column(Series)", extract_column, series),
+        ("extract_column(pyarrow)", extract_column, pyarrow.array(texts)),
+    ]:
+        (seconds, rows) = timed(function, values)
+        assert rows == found
+        print("{:<28} {:>10.1f} ms {:>8.2f}x".format(name, seconds * 1000, baseline / seconds))
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
@@ -0,0 +1,36 @@
+"""
+Measures how extract_many throughput scales with the number of worker
+processes.
+
+Usage:
+
+    python -m benchmarks.bench_extract_many [documents]
+"""
+import os
+import sys
+import time
+
+from address_extractor import extract_many
+
+DOCUMENT = """
+Invoice 20931 issued 2017 for 14 units at 35 dollars each, 7 boxes and
+12 pallets. Ship to 13 Maple St. Phoenix, AZ 85053 or 456 Maple Cir
+Scottsdale, AZ 85255 before day 30. Order 88 of 1200 items, batch 4411.
+""" * 20
+
+def run(count):
+    documents = [DOCUMENT] * count
+    workers = 1
+    baseline = None
+    while workers <= (os.cpu_count() or 1):
+        start = time.perf_counter()
+        for _ in extract_many(documents, workers=workers, chunksize=64):
+            pass
+        rate = count / (time.perf_counter() - start)
+        baseline = baseline or rate
+        print("{:>3} workers {:>10.0f} docs/s {:>6.2f}x".format(
+            workers, rate, rate / baseline))
+        workers *= 2
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
@@ -0,0 +1,41 @@
+"""
+Compares extract_valid with filtering the result of extract_all, and the
+memory each keeps per address.
+
+Usage:
+
+    python -m benchmarks.bench_extract_valid [size_in_kb]
+"""
+import sys
+import time
+import tracemalloc
+
+from address_extractor import extract_all, extract_valid
+from benchmarks.corpus import CorpusGenerator
+
+def filtered(text):
+    return [
+        tuple(getattr(address, name) for name in address.FIELDS) + address.span
+        for address in extract_all(text) if address.is_valid
+    ]
+
+def run(size):
+    text = CorpusGenerator(seed=0).document(size)
+    for (name, extract) in [
+        ("extract_all + is_valid", filtered),
+        ("extract_valid", extract_valid),
+        ("extract_valid as_tuples", lambda text: extract_valid(text, as_tuples=True)),
+    ]:
+        start = time.perf_counter()
+        found = extract(text)
+        seconds = time.perf_counter() - start
+        tracemalloc.start()
+        kept = extract_all(text) if extract is filtered else extract(text)
+        memory = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del kept
+        print("{:<26} {:>8.1f} ms {:>10.0f} KB kept, {} addresses".format(
+            name, seconds * 1000, memory / 1024, len(found)))
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) * 1024 if len(sys.argv) > 1 else 1024 * 1024)
@@ -0,0 +1,43 @@
+"""
+Measures the cold-start cost of the package: how long a fresh
+interpreter takes to import it, and how long the first extraction
+(which loads the reference tables) takes on top of that.
+
+Usage:
+
+    python -m benchmarks.bench_import [runs]
+"""
+import statistics
+import subprocess
+import sys
+
+IMPORT_ONLY = """
+import time
+start = time.perf_counter()
+import address_extractor
+print(time.perf_counter() - start)
+"""
+
+FIRST_EXTRACT = """
+import time
+start = time.perf_counter()
+import address_extractor
+address_extractor.extract_all("13 Maple St. Phoenix, AZ 85053")
+print(time.perf_counter() - start)
+"""
+
+def time_snippet(snippet, runs):
+    timings = []
+    for _ in range(runs):
+        output = subprocess.check_output([sys.executable, "-c", snippet])
+        timings.append(float(output))
+    return statistics.median(timings)
+
+def run(runs):
+    print("import address_extractor: {:.1f} ms".format(
+        time_snippet(IMPORT_ONLY, runs) * 1000))
+    print("import + first extract_all: {:.1f} ms".format(
+        time_snippet(FIRST_EXTRACT, runs) * 1000))
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 10)
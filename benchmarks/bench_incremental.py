@@ -0,0 +1,35 @@
+"""
+Compares following a growing log with the incremental extractor against
+running extract_all over the whole log after every append.
+
+Usage:
+
+    python -m benchmarks.bench_incremental [appends]
+"""
+import sys
+import time
+
+from address_extractor import extract_all
+from address_extractor.incremental import IncrementalExtractor
+from benchmarks.corpus import CorpusGenerator
+
+def run(count):
+    lines = [line + "\n" for line in CorpusGenerator(seed=0, address_density=0.05).documents(count, 200)]
+    text = ""
+    start = time.perf_counter()
+    for line in lines:
+        text += line
+        extract_all(text)
+    rescan = time.perf_counter() - start
+    extractor = IncrementalExtractor()
+    start = time.perf_counter()
+    for line in lines:
+        extractor.append(line)
+    incremental = time.perf_counter() - start
+    assert [x.span for x in extractor.addresses] == [x.span for x in extract_all(text) if x.is_valid]
+    print("{} appends, {} addresses".format(count, len(extractor.addresses)))
+    print("{:<24} {:>10.1f} ms".format("extract_all each time", rescan * 1000))
+    print("{:<24} {:>10.1f} ms {:>8.0f}x".format("IncrementalExtractor", incremental * 1000, rescan / incremental))
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 500)
@@ -0,0 +1,44 @@
+"""
+Compares the peak RSS of a process holding the zipcode table as one
+ZipcodeInfo object per row (the original dict built by load_zipcodes)
+against the memory-mapped, columnar zipcode index.
+
+Usage:
+
+    python -m benchmarks.bench_memory
+"""
+import subprocess
+import sys
+
+SNIPPETS = [
+    ("baseline (import only)", """
+import address_extractor
+"""),
+    ("dict of ZipcodeInfo objects", """
+from address_extractor import zipcode
+table = zipcode.load_zipcodes()
+"""),
+    ("columnar zipcode index", """
+from address_extractor import zipcode
+zipcode.is_valid_place("Scottsdale", "AZ", "85255")
+"""),
+]
+
+MEASURE = """
+import resource, sys
+{snippet}
+scale = 1 if sys.platform == "darwin" else 1024
+print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale)
+"""
+
+def peak_rss(snippet):
+    output = subprocess.check_output(
+        [sys.executable, "-c", MEASURE.format(snippet=snippet)])
+    return int(output)
+
+def run():
+    for (name, snippet) in SNIPPETS:
+        print("{:<30} {:>8.1f} MB".format(name, peak_rss(snippet) / 1024 / 1024))
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,29 @@
+"""
+Measures the cost of parsing a single candidate window with Address,
+for windows that fail at different stages and for a valid address.
+
+Usage:
+
+    python -m benchmarks.bench_parser [repeats]
+"""
+import sys
+import timeit
+
+from address_extractor import Address, tokenize_text
+
+WINDOWS = [
+    ("State Not Found", "14 units at 35 dollars each and 7 boxes on 12 pallets"),
+    ("Zipcode Not Found", "13 cats at Jason's house in Phoenix, AZ. He has 2 dogs"),
+    ("Invalid City/State/Zipcode Combo", "13 Maple St. BadBad, Az 85053 and more"),
+    ("valid", "212 N. Scottsdale Rd APT 14 Scottsdale, AZ 85255"),
+]
+
+def run(repeats):
+    Address(tokenize_text(WINDOWS[-1][1]))
+    for (name, text) in WINDOWS:
+        tokens = tokenize_text(text)
+        seconds = min(timeit.repeat(lambda: Address(tokens), number=repeats, repeat=15))
+        print("{:<34} {:>8.2f} us".format(name, seconds / repeats * 1e6))
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
@@ -0,0 +1,49 @@
+"""
+Compares extract_all with and without the prefilter on number-heavy
+text, where most numeric tokens are prices, years, counts and ids.
+
+Usage:
+
+    python -m benchmarks.bench_prefilter [size_in_kb]
+"""
+import random
+import sys
+import time
+
+from address_extractor import ScanStats, extract_all
+
+WORDS = "invoice order total units boxes price year batch item qty at of and for".split()
+ADDRESS = "13 Maple St. Phoenix, AZ 85053"
+
+def make_text(size, seed=0):
+    rand = random.Random(seed)
+    parts = []
+    length = 0
+    while length < size:
+        if rand.random() < 0.01:
+            part = ADDRESS
+        elif rand.random() < 0.5:
+            part = str(rand.randint(1, 99999))
+        else:
+            part = rand.choice(WORDS)
+        parts.append(part)
+        length += len(part) + 1
+    return " ".join(parts)
+
+def timed(text, **options):
+    start = time.perf_counter()
+    extracted = extract_all(text, **options)
+    return (time.perf_counter() - start, extracted)
+
+def run(size):
+    text = make_text(size)
+    (plain, everything) = timed(text)
+    stats = ScanStats()
+    (filtered, kept) = timed(text, prefilter=True, stats=stats)
+    assert [str(x) for x in everything if x.is_valid] == [str(x) for x in kept if x.is_valid]
+    print("without prefilter: {:.3f}s".format(plain))
+    print("with prefilter:    {:.3f}s ({:.1f}x)".format(filtered, plain / filtered))
+    print(stats)
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) * 1024 if len(sys.argv) > 1 else 1024 * 1024)
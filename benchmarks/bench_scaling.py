@@ -0,0 +1,49 @@
+"""
+Measures how extract_all scales with the size of its input.
+
+Usage:
+
+    python -m benchmarks.bench_scaling [max_size_in_mb]
+
+Doubling the input should roughly double the time; a growing
+seconds-per-MB column means extraction has gone super-linear.
+"""
+import sys
+import time
+
+from address_extractor import extract_all
+
+PARAGRAPH = """
+Invoice 20931 issued 2017 for 14 units at 35 dollars each, 7 boxes and
+12 pallets. Ship to 13 Maple St. Phoenix, AZ 85053 or 456 Maple Cir
+Scottsdale, AZ 85255 before day 30. Order 88 of 1200 items, batch 4411.
+"""
+
+SIZES = [
+    10 * 1024,
+    100 * 1024,
+    1024 * 1024,
+    10 * 1024 * 1024,
+    100 * 1024 * 1024,
+]
+
+def make_text(size):
+    repeats = size // len(PARAGRAPH) + 1
+    return (PARAGRAPH * repeats)[:size]
+
+def run(max_size):
+    print("{:>12} {:>10} {:>10} {:>10}".format("bytes", "seconds", "s/MB", "MB/s"))
+    for size in SIZES:
+        if size > max_size:
+            break
+        text = make_text(size)
+        start = time.perf_counter()
+        extract_all(text)
+        elapsed = time.perf_counter() - start
+        mb = size / (1024 * 1024)
+        print("{:>12} {:>10.3f} {:>10.3f} {:>10.2f}".format(
+            size, elapsed, elapsed / mb, mb / elapsed))
+
+if __name__ == "__main__":
+    max_mb = float(sys.argv[1]) if len(sys.argv) > 1 else 100
+    run(max_mb * 1024 * 1024)
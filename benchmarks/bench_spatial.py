@@ -0,0 +1,66 @@
+"""
+Compares nearest-zipcode and radius queries on the spatial index with a
+linear scan over every zipcode.
+
+Usage:
+
+    python -m benchmarks.bench_spatial [queries]
+"""
+import math
+import random
+import sys
+import time
+
+from address_extractor import spatial, zipcode, zipcode_index
+
+def brute_force(latitude, longitude):
+    # the haversine distance to every zipcode, as the linear scan did
+    table = zipcode.index()
+    latitude = math.radians(latitude)
+    longitude = math.radians(longitude)
+    cos_latitude = math.cos(latitude)
+    distances = []
+    for (number, other_latitude, other_longitude) in zip(
+            table.zipcodes, table.latitudes, table.longitudes):
+        other_latitude = math.radians(other_latitude)
+        haversine = (
+            math.sin((other_latitude - latitude) / 2) ** 2
+            + cos_latitude * math.cos(other_latitude)
+            * math.sin((math.radians(other_longitude) - longitude) / 2) ** 2
+        )
+        distances.append((2 * spatial.EARTH_RADIUS_KM * math.asin(math.sqrt(haversine)), number))
+    distances.sort()
+    return [(zipcode_index.format_zipcode(number), km) for (km, number) in distances]
+
+def per_query(queries, query):
+    start = time.perf_counter()
+    for (latitude, longitude) in queries:
+        query(latitude, longitude)
+    return (time.perf_counter() - start) / len(queries) * 1e6
+
+def run(count):
+    rand = random.Random(0)
+    # points around the zipcodes themselves, where queries are made
+    table = zipcode.index()
+    rows = [rand.randrange(len(table)) for _ in range(count)]
+    queries = [
+        (table.latitudes[row] + rand.uniform(-0.5, 0.5),
+         table.longitudes[row] + rand.uniform(-0.5, 0.5))
+        for row in rows
+    ]
+    start = time.perf_counter()
+    spatial.tree()
+    print("{:<24} {:>10.1f} ms".format("build tree", (time.perf_counter() - start) * 1000))
+    brute = per_query(queries[:20], brute_force)
+    print("{:<24} {:>10.1f} us".format("brute force scan", brute))
+    for (name, query) in [
+        ("nearest_zipcodes k=1", lambda lat, lon: spatial.nearest_zipcodes(lat, lon, 1)),
+        ("nearest_zipcodes k=10", lambda lat, lon: spatial.nearest_zipcodes(lat, lon, 10)),
+        ("zipcodes_within 10 km", lambda lat, lon: spatial.zipcodes_within(lat, lon, 10)),
+        ("zipcodes_within 50 km", lambda lat, lon: spatial.zipcodes_within(lat, lon, 50)),
+    ]:
+        seconds = per_query(queries, query)
+        print("{:<24} {:>10.1f} us {:>8.0f}x".format(name, seconds, brute / seconds))
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 1000)
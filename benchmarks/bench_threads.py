@@ -0,0 +1,40 @@
+"""
+Measures how extract_many_threaded throughput scales with the number of
+threads.
+
+With the GIL the threads take turns, so throughput stays flat; on a
+free-threaded build of CPython (e.g. python3.13t, run with PYTHON_GIL=0)
+it should grow with the threads up to the number of cores.
+
+Usage:
+
+    python -m benchmarks.bench_threads [documents]
+"""
+import os
+import sys
+import time
+
+from address_extractor import extract_many_threaded
+from benchmarks.bench_extract_many import DOCUMENT
+
+def gil_enabled():
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    return True if is_gil_enabled is None else is_gil_enabled()
+
+def run(count):
+    documents = [DOCUMENT] * count
+    print("GIL enabled: {}".format(gil_enabled()))
+    workers = 1
+    baseline = None
+    while workers <= (os.cpu_count() or 1):
+        start = time.perf_counter()
+        for _ in extract_many_threaded(documents, workers=workers):
+            pass
+        rate = count / (time.perf_counter() - start)
+        baseline = baseline or rate
+        print("{:>3} threads {:>10.0f} docs/s {:>6.2f}x".format(
+            workers, rate, rate / baseline))
+        workers *= 2
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
@@ -0,0 +1,99 @@
+"""
+Generates synthetic corpora for the benchmarks from the packaged
+reference data.
+
+Documents mix filler words, free-standing numbers and addresses built
+from real us_zipcodes.csv rows, street_types.txt and unit_types.txt.
+Some addresses are corrupted (see `noise`) so the parser also sees
+near misses.
+
+Usage:
+
+    python -m benchmarks.corpus [size_in_kb] > corpus.txt
+"""
+import random
+import sys
+
+from address_extractor import datafile
+
+FILLER = (
+    "the of and to in is was for on that with as by at from his her they "
+    "invoice order total units boxes price paid year batch item qty please "
+    "send ship deliver meeting house office call email note see attached"
+).split()
+
+STREET_NAMES = (
+    "Maple Oak Main Park Elm Cedar Washington Lake Hill Pine Cottonwood "
+    "Sunset Lincoln Jackson Jefferson Madison Franklin Highland Scottsdale"
+).split()
+
+DIRECTIONS = ["N", "S", "E", "W", "NE", "SW"]
+
+class CorpusGenerator(object):
+    """
+    `address_density` and `number_density` are the chances that a chunk of
+    the document is an address or a number rather than a filler word, and
+    `noise` is the chance that an address is corrupted.
+    """
+    def __init__(self, seed=0, address_density=0.01, number_density=0.1, noise=0.2):
+        self.random = random.Random(seed)
+        self.address_density = address_density
+        self.number_density = number_density
+        self.noise = noise
+        self.places = [line.split(",") for line in datafile.read_us_zipcodes()[1:] if line]
+        self.street_types = [line for line in datafile.read_street_types() if line]
+        self.unit_types = [line.split(",")[0] for line in datafile.read_unit_types() if line]
+
+    def address(self):
+        rand = self.random
+        (zipcode, city, _, state, _, _, _) = rand.choice(self.places)
+        parts = [str(rand.randint(1, 9999))]
+        if rand.random() < 0.2:
+            parts.append(rand.choice(DIRECTIONS) + ".")
+        parts.append(rand.choice(STREET_NAMES))
+        parts.append(rand.choice(self.street_types).title())
+        if rand.random() < 0.2:
+            parts.append("{} {}".format(rand.choice(self.unit_types), rand.randint(1, 400)))
+        parts.append(city + ",")
+        parts.append(state)
+        parts.append(zipcode)
+        if rand.random() < self.noise:
+            self.corrupt(parts)
+        return " ".join(parts)
+
+    def corrupt(self, parts):
+        rand = self.random
+        damage = rand.randrange(3)
+        if damage == 0:
+            parts.pop()  # no zipcode
+        elif damage == 1:
+            parts[-1] = "{:05d}".format(rand.randint(0, 99999))
+        else:
+            parts[-3] = rand.choice(STREET_NAMES) + ","  # wrong city
+
+    def chunk(self):
+        roll = self.random.random()
+        if roll < self.address_density:
+            return self.address()
+        if roll < self.address_density + self.number_density:
+            return str(self.random.randint(1, 99999))
+        return self.random.choice(FILLER)
+
+    def document(self, size):
+        """
+        A document of about `size` characters.
+        """
+        parts = []
+        length = 0
+        while length < size:
+            part = self.chunk()
+            parts.append(part)
+            length += len(part) + 1
+        return " ".join(parts)
+
+    def documents(self, count, size):
+        return [self.document(size) for _ in range(count)]
+
+if __name__ == "__main__":
+    size = int(sys.argv[1]) * 1024 if len(sys.argv) > 1 else 1024 * 1024
+    sys.stdout.write(CorpusGenerator().document(size))
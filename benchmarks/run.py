@@ -0,0 +1,157 @@
+"""
+Runs the benchmark suite on a synthetic corpus and writes the results as
+json, so that runs can be compared across versions.
+
+Usage:
+
+    python -m benchmarks.run [--size KB] [--documents N] [--output results.json]
+    python -m benchmarks.run --compare before.json after.json
+"""
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+from address_extractor import ScanStats, extract_all, profiling
+from benchmarks.bench_import import FIRST_EXTRACT, IMPORT_ONLY, time_snippet
+from benchmarks.corpus import CorpusGenerator
+
+def git_revision():
+    try:
+        output = subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL)
+        return output.decode("ascii").strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def measure_throughput(documents, **options):
+    size = sum(len(document) for document in documents)
+    stats = ScanStats()
+    valid = 0
+    start = time.perf_counter()
+    for document in documents:
+        for address in extract_all(document, stats=stats, **options):
+            valid += address.is_valid
+    elapsed = time.perf_counter() - start
+    return {
+        "seconds": elapsed,
+        "docs_per_second": len(documents) / elapsed,
+        "mb_per_second": size / (1024 * 1024) / elapsed,
+        "candidates": stats.candidates,
+        "parsed": stats.parsed,
+        "valid": valid,
+    }
+
+def measure_stages(documents):
+    """
+    Profiles every stage of Address._parse while extracting `documents`.
+    """
+    with profiling.profile() as profiler:
+        for document in documents:
+            extract_all(document)
+    results = dict(
+        (name, {
+            "calls": calls,
+            "mean_us": profiler.stage_seconds[name] / calls * 1e6,
+        })
+        for (name, calls) in profiler.stage_calls.items()
+    )
+    results["rejections"] = dict(profiler.rejections)
+    return results
+
+def measure_memory(documents):
+    tracemalloc.start()
+    try:
+        for document in documents:
+            extract_all(document)
+        (_, peak) = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {"traced_peak_mb": peak / (1024 * 1024)}
+
+def measure_import(runs):
+    return {
+        "import_ms": time_snippet(IMPORT_ONLY, runs) * 1000,
+        "first_extract_ms": time_snippet(FIRST_EXTRACT, runs) * 1000,
+    }
+
+def run(args):
+    generator = CorpusGenerator(
+        seed=args.seed,
+        address_density=args.address_density,
+        number_density=args.number_density,
+        noise=args.noise,
+    )
+    documents = generator.documents(args.documents, args.size * 1024)
+    extract_all("13 Maple St. Phoenix, AZ 85053")
+    return {
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "timestamp": time.time(),
+        "corpus": {
+            "seed": args.seed,
+            "documents": args.documents,
+            "document_kb": args.size,
+            "address_density": args.address_density,
+            "number_density": args.number_density,
+            "noise": args.noise,
+        },
+        "throughput": measure_throughput(documents),
+        "throughput_prefilter": measure_throughput(documents, prefilter=True),
+        "stages": measure_stages(documents),
+        "memory": measure_memory(documents),
+        "import": measure_import(args.import_runs),
+    }
+
+def flatten(results, prefix=""):
+    flat = {}
+    for (key, value) in results.items():
+        if isinstance(value, dict):
+            flat.update(flatten(value, prefix + key + "."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[prefix + key] = value
+    return flat
+
+def compare(before_path, after_path):
+    with open(before_path) as f:
+        before = flatten(json.load(f))
+    with open(after_path) as f:
+        after = flatten(json.load(f))
+    for key in sorted(set(before) & set(after)):
+        if key.startswith(("corpus.", "timestamp")):
+            continue
+        ratio = after[key] / before[key] if before[key] else float("nan")
+        print("{:<45} {:>12.3f} {:>12.3f} {:>8.2f}x".format(
+            key, before[key], after[key], ratio))
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--documents", type=int, default=50)
+    parser.add_argument("--size", type=int, default=20, help="document size in KB")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--address-density", type=float, default=0.01)
+    parser.add_argument("--number-density", type=float, default=0.1)
+    parser.add_argument("--noise", type=float, default=0.2)
+    parser.add_argument("--import-runs", type=int, default=5)
+    parser.add_argument("--output", help="write the results to this file")
+    parser.add_argument("--compare", nargs=2, metavar=("BEFORE", "AFTER"))
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.compare:
+        compare(*args.compare)
+        return
+    results = run(args)
+    text = json.dumps(results, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    print(text)
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
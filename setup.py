@@ -40,9 +40,15 @@ setup(
         'Development Status :: 3 - Alpha',
         'Intended Audience :: Developers',
         'License :: OSI Approved :: MIT License',
-        'Programming Language :: Python :: 3.5',
+        'Programming Language :: Python :: 3',
+        'Programming Language :: Python :: 3 :: Only',
+        'Programming Language :: Python :: 3.9',
     ],
 
+    # module __getattr__, str.isascii, math.dist, accumulate(initial=) and
+    # ThreadPoolExecutor.shutdown(cancel_futures=)
+    python_requires='>=3.9',
+
     # What does your project relate to?
     keywords='address zipcode mail',
 
@@ -63,10 +69,11 @@ setup(
     # dependencies). You can install these using the following syntax,
     # for example:
     # $ pip install -e .[dev,test]
-    # extras_require={
-    #     'dev': ['check-manifest'],
-    #     'test': ['coverage'],
-    # },
+    extras_require={
+        'numpy': ['numpy'],
+        'pandas': ['pandas'],
+        'arrow': ['pyarrow'],
+    },
 
     # If there are data files included in your packages that need to be
     # installed, specify them here.  If using Python 2.6 or less, then these
@@ -76,6 +83,7 @@ setup(
             'data/street_types.txt',
             'data/unit_types.txt',
             'data/us_zipcodes.csv',
+            'data/us_zipcodes.idx',
         ],
     },
 
@@ -90,5 +98,9 @@ setup(
     # To provide executable scripts, use entry points in preference to the
     # "scripts" keyword. Entry points provide cross-platform support and allow
     # pip to create the appropriate form of executable for the target platform.
-    entry_points={},
+    entry_points={
+        'console_scripts': [
+            'address-extract=address_extractor.cli:main',
+        ],
+    },
 )
\ No newline at end of file
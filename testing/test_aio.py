@@ -0,0 +1,87 @@
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from address_extractor import aio
+
+PHRASE = "Jason lives at 13 Maple St. Phoenix, AZ 85053 with his cats."
+
+def test_extract_all_runs_in_an_executor():
+    with ThreadPoolExecutor(1) as executor:
+        extracted = asyncio.run(aio.extract_all(PHRASE, executor))
+    assert [str(x) for x in extracted] == ["13 Maple St Phoenix AZ 85053"]
+
+def test_extract_all_passes_options():
+    text = "There are 13 cats at jason's house in Phoenix, AZ."
+    assert asyncio.run(aio.extract_all(text, prefilter=True)) == []
+
+def test_extract_stream_keeps_document_order():
+    documents = [PHRASE, "no numbers here", "456 Maple Cir Scottsdale, AZ 85255"] * 5
+
+    async def source():
+        for text in documents:
+            await asyncio.sleep(0)
+            yield text
+
+    async def collect():
+        return [x async for x in aio.extract_stream(source(), max_pending=2)]
+
+    results = asyncio.run(collect())
+    assert [[str(x) for x in addresses] for addresses in results] == [
+        ["13 Maple St Phoenix AZ 85053"],
+        [],
+        ["456 Maple Cir Scottsdale AZ 85255"],
+    ] * 5
+
+def test_line_server_answers_each_line_with_json():
+    async def roundtrip():
+        server = await aio.start_server(port=0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(PHRASE.encode("utf-8") + b"\nnothing here\n")
+            await writer.drain()
+            first = await reader.readline()
+            second = await reader.readline()
+            writer.close()
+        return (json.loads(first), json.loads(second))
+
+    (first, second) = asyncio.run(roundtrip())
+    assert second == []
+    assert first == [{
+        "street_number": "13",
+        "street_direction": None,
+        "street_name": "Maple",
+        "street_type": "St",
+        "unit": None,
+        "city": "Phoenix",
+        "state": "AZ",
+        "zipcode": "85053",
+        "error": None,
+        "span": [15, 45],
+    }]
+
+def test_extract_stream_cleans_up_when_abandoned():
+    async def early_stop():
+        stream = aio.extract_stream([PHRASE] * 50, max_pending=2)
+        async for _ in stream:
+            # let the submitter fill the queue before stopping
+            await asyncio.sleep(0.05)
+            break
+        await asyncio.wait_for(stream.aclose(), 5)
+        return [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+
+    assert asyncio.run(early_stop()) == []
+
+def test_extract_stream_raises_errors_of_the_documents():
+    async def failing():
+        yield PHRASE
+        raise ValueError("broken source")
+
+    async def collect():
+        return [x async for x in aio.extract_stream(failing(), max_pending=1)]
+
+    with pytest.raises(ValueError, match="broken source"):
+        asyncio.run(asyncio.wait_for(collect(), 5))
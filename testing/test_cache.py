@@ -0,0 +1,86 @@
+import threading
+
+import pytest
+
+from address_extractor import extract_all, iter_extract, profiling
+from address_extractor.cache import ParseCache
+
+PHRASE = """
+There are 13 cats at Jason's house in Phoenix, AZ. Jason lives at 13
+Maple St. Phoenix, Az 85053 and his mom lives at 456 Maple Cir
+Scottsdale, AZ 85255 with her BF.
+"""
+
+def test_cached_results_match_uncached_results():
+    cache = ParseCache()
+    expected = [(repr(x), x.span) for x in extract_all(PHRASE * 3)]
+    first = [(repr(x), x.span) for x in extract_all(PHRASE * 3, cache=cache)]
+    second = [(repr(x), x.span) for x in extract_all(PHRASE * 3, cache=cache)]
+    assert first == expected
+    assert second == expected
+    info = cache.info()
+    # 9 candidates per pass; windows near the joins differ in their tails
+    assert info.hits + info.misses == 18
+    assert info.misses == info.currsize == 4
+
+def test_cached_addresses_keep_their_fields():
+    cache = ParseCache()
+    list(iter_extract("212 N. Scottsdale Rd APT 14 Scottsdale, AZ 85255", cache=cache))
+    addr = next(iter_extract("212 N. Scottsdale Rd APT 14 Scottsdale, AZ 85255", cache=cache))
+    assert cache.info().hits == 1
+    assert addr.street_direction == "N"
+    assert addr.unit == "APT 14"
+    assert str(addr) == "212 N Scottsdale Rd APT 14 Scottsdale AZ 85255"
+
+def test_cache_hits_are_still_profiled():
+    cache = ParseCache()
+    extract_all(PHRASE, cache=cache)
+    with profiling.profile() as profiler:
+        extract_all(PHRASE, cache=cache)
+    assert profiler.candidates == 3
+    assert profiler.rejections == {"Zipcode Not Found": 1}
+    assert sum(profiler.stage_calls.values()) == 0
+
+def test_lru_eviction_keeps_recently_used_entries():
+    cache = ParseCache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert len(cache) == 2
+
+def test_fifo_eviction_drops_the_oldest_entry():
+    cache = ParseCache(maxsize=2, eviction="fifo")
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+    assert cache.get("a") is None
+    assert cache.get("b") == 2
+
+def test_invalid_settings():
+    with pytest.raises(ValueError):
+        ParseCache(maxsize=0)
+    with pytest.raises(ValueError):
+        ParseCache(eviction="random")
+
+def test_cache_can_be_shared_between_threads():
+    cache = ParseCache(maxsize=2)
+    expected = [repr(x) for x in extract_all(PHRASE)]
+    failures = []
+
+    def work():
+        for _ in range(50):
+            if [repr(x) for x in extract_all(PHRASE, cache=cache)] != expected:
+                failures.append(True)
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert failures == []
+    info = cache.info()
+    assert info.hits + info.misses == 4 * 50 * 3
@@ -0,0 +1,23 @@
+from address_extractor import cities, zipcode
+
+def test_expand_abbreviation():
+    assert cities.expand_abbreviation("St") == "saint"
+    assert cities.expand_abbreviation("Louis") == "Louis"
+
+def test_token_variants_include_abbreviations():
+    assert sorted(cities.token_variants("saint")) == ["saint", "st"]
+    assert cities.token_variants("louis") == ["louis"]
+    # 'st' always expands to 'saint', so it never matches itself
+    assert cities.token_variants("st") == []
+
+def test_city_trie_is_keyed_from_the_last_token():
+    trie = cities.city_trie("Saint Louis")
+    assert cities.CITY_END in trie["louis"]["saint"]
+    assert cities.CITY_END in trie["louis"]["st"]
+    assert cities.CITY_END not in trie["louis"]
+
+def test_zipcode_city_trie_checks_the_state():
+    assert zipcode.city_trie("63103", "MO") == cities.city_trie("saint louis")
+    assert zipcode.city_trie("63103-1234", "missouri") is not None
+    assert zipcode.city_trie("63103", "AZ") is None
+    assert zipcode.city_trie("99999", "MO") is None
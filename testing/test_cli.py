@@ -0,0 +1,71 @@
+import csv
+import io
+import json
+import sys
+
+from address_extractor import cli
+
+def write_files(tmp_path):
+    (tmp_path / "docs").mkdir()
+    (tmp_path / "docs" / "a.txt").write_text("Jason lives at 13 Maple St. Phoenix, AZ 85053.")
+    (tmp_path / "docs" / "b.txt").write_text("His mom lives at 456 Maple Cir Scottsdale, AZ 85255")
+    (tmp_path / "c.log").write_text("There are 13 cats in Phoenix, AZ.")
+
+def run(argv):
+    out = io.StringIO()
+    err = io.StringIO()
+    assert cli.main(argv + ["--workers", "1"], out=out, err=err) == 0
+    return (out.getvalue(), err.getvalue())
+
+def test_jsonl_records_for_directories_and_globs(tmp_path):
+    write_files(tmp_path)
+    (out, err) = run([str(tmp_path / "docs"), str(tmp_path / "*.log")])
+    records = [json.loads(line) for line in out.splitlines()]
+    assert [(r["path"], r["zipcode"], r["error"]) for r in records] == [
+        (str(tmp_path / "docs" / "a.txt"), "85053", None),
+        (str(tmp_path / "docs" / "b.txt"), "85255", None),
+        (str(tmp_path / "c.log"), None, "Zipcode Not Found"),
+    ]
+    assert (records[0]["start"], records[0]["end"]) == (15, 46)
+    assert records[0]["street_name"] == "Maple"
+    assert "3 docs" in err
+
+def test_csv_output_of_valid_addresses(tmp_path):
+    write_files(tmp_path)
+    (out, _) = run([str(tmp_path), "--format", "csv", "--valid-only", "--quiet"])
+    rows = list(csv.DictReader(io.StringIO(out)))
+    assert [row["city"] for row in rows] == ["Phoenix", "Scottsdale"]
+    assert list(rows[0]) == list(cli.COLUMNS)
+
+def test_reads_stdin(monkeypatch):
+    stdin = io.TextIOWrapper(io.BytesIO(b"1010 W. COTTONWOOD LN. SURPRISE, AZ 85374-3628"))
+    monkeypatch.setattr(sys, "stdin", stdin)
+    (out, _) = run(["--quiet"])
+    record = json.loads(out)
+    assert record["path"] == "-"
+    assert record["street_direction"] == "W"
+
+def test_worker_pool_keeps_file_order(tmp_path):
+    write_files(tmp_path)
+    out = io.StringIO()
+    cli.main([str(tmp_path / "docs"), "--workers", "2", "--chunksize", "1", "--quiet"], out=out)
+    assert [json.loads(line)["zipcode"] for line in out.getvalue().splitlines()] == [
+        "85053", "85255",
+    ]
+
+def test_missing_paths_are_reported(tmp_path):
+    err = io.StringIO()
+    assert cli.main([str(tmp_path / "nothing*")], out=io.StringIO(), err=err) == 2
+    assert "no files match" in err.getvalue()
+
+def test_stdin_keeps_its_place_among_files(tmp_path, monkeypatch):
+    write_files(tmp_path)
+    a = str(tmp_path / "docs" / "a.txt")
+    b = str(tmp_path / "docs" / "b.txt")
+    for workers in ("1", "2"):
+        stdin = io.TextIOWrapper(io.BytesIO(b"1010 W. COTTONWOOD LN. SURPRISE, AZ 85374"))
+        monkeypatch.setattr(sys, "stdin", stdin)
+        out = io.StringIO()
+        cli.main([a, "-", b, "--workers", workers, "--quiet"], out=out)
+        paths = [json.loads(line)["path"] for line in out.getvalue().splitlines()]
+        assert paths == [a, "-", b]
@@ -0,0 +1,68 @@
+import pytest
+
+from address_extractor import extract_all
+
+TEXTS = [
+    "13 Maple St. Phoenix, AZ 85053 and 456 Maple Cir Scottsdale, AZ 85255",
+    None,
+    "There are 13 cats at Jason's house in Phoenix, AZ.",
+    "212 N. Scottsdale Rd #14 Scottsdale, AZ 85255",
+]
+
+def expected_rows(texts, infer_zipcode=False):
+    rows = []
+    for (row, text) in enumerate(texts):
+        for address in extract_all(text or "", infer_zipcode=infer_zipcode):
+            if address.is_valid:
+                values = dict(zipcode_candidates=None, row=row, start=address.span[0], end=address.span[1])
+                values.update(address.to_dict())
+                rows.append(values)
+    return rows
+
+def test_extract_column_from_arrow():
+    pa = pytest.importorskip("pyarrow")
+    from address_extractor.columnar import COLUMNS, extract_column
+    strings = pa.chunked_array([TEXTS[:2], TEXTS[2:]], type=pa.string())
+    table = extract_column(strings, batch_size=1)
+    assert table.column_names == list(COLUMNS)
+    assert table.schema.field("start").type == pa.int64()
+    assert table.schema.field("unit").type == pa.string()
+    expected = [dict((name, row[name]) for name in COLUMNS) for row in expected_rows(TEXTS)]
+    assert table.to_pylist() == expected
+    assert [row["unit"] for row in expected] == [None, None, "# 14"]
+    assert extract_column(pa.array(TEXTS)).to_pylist() == expected
+
+def test_extract_column_from_pandas():
+    pd = pytest.importorskip("pandas")
+    from address_extractor.columnar import COLUMNS, extract_column
+    frame = extract_column(pd.Series(TEXTS, index=[10, 20, 30, 40]))
+    assert list(frame.columns) == list(COLUMNS)
+    assert frame["row"].tolist() == [0, 0, 3]
+    assert frame["end"].dtype == "int64"
+    assert frame["zipcode"].tolist() == ["85053", "85255", "85255"]
+    assert frame["unit"].isna().tolist() == [True, True, False]
+
+def test_extract_column_without_addresses():
+    pa = pytest.importorskip("pyarrow")
+    from address_extractor.columnar import COLUMNS, extract_column
+    table = extract_column(pa.array(["no addresses here", None]))
+    assert table.num_rows == 0
+    assert table.column_names == list(COLUMNS)
+
+def test_extract_column_keeps_inferred_zipcode_candidates():
+    pa = pytest.importorskip("pyarrow")
+    pd = pytest.importorskip("pandas")
+    from address_extractor.columnar import COLUMNS, extract_column
+    texts = ["13 Maple St. Phoenix, AZ and more", TEXTS[0]]
+    table = extract_column(pa.array(texts), infer_zipcode=True)
+    assert table.schema.field("zipcode_candidates").type == pa.list_(pa.string())
+    expected = [
+        dict((name, row[name]) for name in COLUMNS)
+        for row in expected_rows(texts, infer_zipcode=True)
+    ]
+    assert table.to_pylist() == expected
+    (inferred, with_zipcode) = table.to_pylist()[:2]
+    assert inferred["zipcode"] is None and "85053" in inferred["zipcode_candidates"]
+    assert with_zipcode["zipcode_candidates"] is None
+    frame = extract_column(pd.Series(texts), infer_zipcode=True)
+    assert frame["zipcode_candidates"].tolist() == [row["zipcode_candidates"] for row in expected]
@@ -0,0 +1,36 @@
+import subprocess
+import sys
+
+from address_extractor import (
+    datafile,
+    street_type,
+    unit_type,
+    zipcode,
+)
+
+def test_read_street_types():
+    lines = datafile.read_street_types()
+    assert "ALLEY" in lines
+
+def test_read_us_zipcodes_has_header():
+    lines = datafile.read_us_zipcodes()
+    assert lines[0] == "zipcode,city,state_name,state,county,latitude,longitude"
+
+def test_importing_does_not_load_reference_tables():
+    snippet = "\n".join([
+        "import address_extractor",
+        "from address_extractor import zipcode, street_type, unit_type",
+        "assert zipcode._index is None",
+        "assert zipcode.zipcode_infos.cache_info().currsize == 0",
+        "assert street_type.street_types.cache_info().currsize == 0",
+        "assert unit_type.unit_types.cache_info().currsize == 0",
+        "assert 'pkg_resources' not in __import__('sys').modules",
+    ])
+    subprocess.check_call([sys.executable, "-c", snippet])
+
+def test_lazy_tables_are_still_module_attributes():
+    assert "apt" in unit_type.UNIT_TYPES
+    assert "street" in street_type.STREET_TYPES
+    assert "az" in zipcode.STATES
+    assert "85255" in zipcode.ZIPCODES
+    assert zipcode.ZIPCODE_INFOS["85255"].city == "scottsdale"
@@ -0,0 +1,41 @@
+from address_extractor import extract_all, extract_many
+
+DOCUMENTS = [
+    "13 Maple St. Phoenix, AZ 85053",
+    "There are 13 cats at Jason's house in Phoenix, AZ.",
+    "Some non-numbered sentence that mentions Phoenix, AZ",
+    "1010 W. COTTONWOOD LN. SURPRISE, AZ 85374-3628",
+    "212 N. Scottsdale Rd APT 14 Scottsdale, AZ 85255",
+] * 4
+
+def reprs(addresses):
+    return [repr(x) for x in addresses]
+
+def test_extract_many_returns_results_in_order():
+    expected = [reprs(extract_all(doc)) for doc in DOCUMENTS]
+    results = extract_many(DOCUMENTS, workers=2, chunksize=3)
+    assert [reprs(x) for x in results] == expected
+
+def test_extract_many_unordered_returns_positions():
+    expected = [reprs(extract_all(doc)) for doc in DOCUMENTS]
+    results = list(extract_many(iter(DOCUMENTS), workers=2, ordered=False))
+    assert sorted(position for (position, _) in results) == list(range(len(DOCUMENTS)))
+    for (position, addresses) in results:
+        assert reprs(addresses) == expected[position]
+
+def test_extract_many_reads_only_a_few_chunks_ahead():
+    read = []
+
+    def documents():
+        for number in range(1000):
+            read.append(number)
+            yield DOCUMENTS[number % len(DOCUMENTS)]
+
+    results = extract_many(documents(), workers=2, chunksize=2)
+    assert reprs(next(results)) == reprs(extract_all(DOCUMENTS[0]))
+    # two workers keep at most eight chunks of two documents in flight
+    assert len(read) <= 2 * 2 * 4 + 2
+    results.close()
+    unordered = extract_many(documents(), workers=2, chunksize=2, ordered=False)
+    next(unordered)
+    unordered.close()
@@ -0,0 +1,54 @@
+import pickle
+
+import pytest
+
+from address_extractor import ScanStats, ValidAddress, extract_all, extract_valid
+
+TEXT = (
+    "13 Maple St. Phoenix, AZ 85053 and 456 Maple Cir Scottsdale, AZ 85255, "
+    "there are 13 cats in Phoenix, AZ. 212 N. Scottsdale Rd #14 Scottsdale, AZ 85255 "
+    "or 1 Main St St. Louis MO 63103"
+)
+
+def test_extract_valid_matches_extract_all():
+    expected = [address for address in extract_all(TEXT) if address.is_valid]
+    found = extract_valid(TEXT)
+    assert len(found) == len(expected) == 4
+    for (address, valid) in zip(expected, found):
+        assert isinstance(valid, ValidAddress)
+        assert valid.to_dict() == address.to_dict()
+        assert str(valid) == str(address)
+        assert valid.span == address.span
+    assert found[2].unit == "# 14"
+    assert found[2].street_direction == "N"
+
+def test_extract_valid_as_tuples():
+    tuples = extract_valid(TEXT, as_tuples=True)
+    assert type(tuples[0]) is tuple
+    assert tuples == [tuple(valid) for valid in extract_valid(TEXT)]
+    assert tuples[0] == ("13", None, "Maple", "St", None, "Phoenix", "AZ", "85053", 0, 30, None)
+
+def test_valid_addresses_are_immutable():
+    valid = extract_valid(TEXT)[0]
+    with pytest.raises(AttributeError):
+        valid.city = "Tempe"
+    with pytest.raises(AttributeError):
+        valid.__dict__
+    assert pickle.loads(pickle.dumps(valid)) == valid
+    assert len(set(extract_valid(TEXT + " " + TEXT))) == 8
+
+def test_extract_valid_skips_invalid_candidates():
+    stats = ScanStats()
+    assert extract_valid("Order 88 of 1200 items, 7 boxes.", stats=stats) == []
+    assert stats.candidates == 3 and stats.pruned == 3
+
+def test_extract_valid_can_infer_zipcodes():
+    text = "13 Maple St. Phoenix, AZ"
+    (valid,) = extract_valid(text, infer_zipcode=True)
+    (address,) = extract_all(text, infer_zipcode=True)
+    assert valid.zipcode is None
+    assert "85053" in valid.zipcode_candidates
+    assert valid.zipcode_candidates == address.zipcode_candidates
+    assert valid.to_dict() == address.to_dict()
+    assert str(valid) == "13 Maple St Phoenix AZ"
+    assert hash(valid) == hash(extract_valid(text, infer_zipcode=True)[0])
@@ -1,4 +1,12 @@
-from address_extractor import extract_all
+import io
+import mmap
+
+from address_extractor import (
+    ScanStats,
+    extract_all,
+    extract_all_bytes,
+    iter_extract,
+)
 
 def test_extract_all_works_on_simple_addresses():
     phrase = "13 Maple St. Phoenix, AZ 85053"
@@ -224,4 +232,173 @@ def test_extract_all_fails_on_too_short_addresses():
     extracted = extract_all(phrase)
     assert len(extracted) == 1
     addr1 = extracted[0]
-    assert addr1.error == "State Not Found"
\ No newline at end of file
+    assert addr1.error == "State Not Found"
+
+def test_iter_extract_matches_extract_all():
+    phrase = """
+    There are 13 cats at Jason's house in Phoenix, AZ. Jason lives at 13
+    Maple St. Phoenix, Az 85053 and his mom lives at 456 Maple Cir
+    Scottsdale, AZ 85255 with her BF.
+    """
+    expected = [repr(x) for x in extract_all(phrase)]
+    assert [repr(x) for x in iter_extract(phrase)] == expected
+
+def test_iter_extract_finds_addresses_split_across_chunks():
+    phrase = "Jason lives at 13 Maple St. Phoenix, AZ 85053 with his cats."
+    expected = [repr(x) for x in extract_all(phrase)]
+    for size in range(1, len(phrase)):
+        chunks = [phrase[i:i + size] for i in range(0, len(phrase), size)]
+        assert [repr(x) for x in iter_extract(chunks)] == expected
+
+def test_iter_extract_reads_file_objects():
+    phrase = "13 Maple St. Phoenix, AZ 85053\n456 Maple Cir Scottsdale, AZ 85255\n"
+    extracted = list(iter_extract(io.StringIO(phrase)))
+    assert [str(x) for x in extracted] == [
+        "13 Maple St Phoenix AZ 85053",
+        "456 Maple Cir Scottsdale AZ 85255",
+    ]
+
+def test_iter_extract_is_lazy():
+    def chunks():
+        yield "13 Maple St. Phoenix, AZ 85053 "
+        yield "and then some other words follow "
+        raise AssertionError("read too far")
+    extracted = iter_extract(chunks())
+    assert str(next(extracted)) == "13 Maple St Phoenix AZ 85053"
+
+
+def test_addresses_know_their_span_in_the_source_text():
+    phrase = "Jason lives at 13 Maple St. Phoenix, AZ 85053 with his cats."
+    addr = extract_all(phrase)[0]
+    assert addr.span == (15, 45)
+    assert addr.source_text == "13 Maple St. Phoenix, AZ 85053"
+
+def test_span_accounts_for_split_unit_numbers():
+    phrase = "at 212 N. Scottsdale Rd #14 Scottsdale, AZ 85255"
+    addr = extract_all(phrase)[0]
+    assert addr.unit == "# 14"
+    assert addr.source_text == "212 N. Scottsdale Rd #14 Scottsdale, AZ 85255"
+    unit_start = addr.offsets[addr.unit_range[0]][0]
+    assert phrase[unit_start:addr.offsets[addr.unit_range[1] - 1][1]] == "#14"
+
+def test_invalid_addresses_have_no_span():
+    addr = extract_all("There are 13 cats at jason's house in Phoenix, AZ.")[0]
+    assert addr.span is None
+    assert addr.source_text is None
+
+def test_iter_extract_spans_are_relative_to_the_stream():
+    phrase = "Jason lives at 13 Maple St. Phoenix, AZ 85053 with his cats."
+    chunks = [phrase[i:i + 7] for i in range(0, len(phrase), 7)]
+    addr = next(iter_extract(chunks))
+    assert addr.span == (15, 45)
+    assert addr.source_text is None
+
+def test_prefilter_keeps_every_valid_address():
+    phrase = """
+    Invoice 20931 from 2017: 14 units at 35 dollars, 7 boxes and 12 pallets.
+    There are 13 cats at Jason's house in Phoenix, AZ. Jason lives at 13
+    Maple St. Phoenix, Az 85053 and his mom lives at 456 Maple Cir
+    Scottsdale, AZ 85255 with her BF. 13 Maple St. BadBad, Az 85053
+    """
+    expected = [repr(x) for x in extract_all(phrase) if x.error not in (
+        "State Not Found",
+        "Zipcode Not Found",
+        "Invalid Address Format - Too short",
+    )]
+    stats = ScanStats()
+    extracted = extract_all(phrase, prefilter=True, stats=stats)
+    assert [repr(x) for x in extracted] == expected
+    assert extracted[-1].error == "Invalid City/State/Zipcode Combo"
+    assert stats.candidates == 10
+    assert stats.pruned == 7
+    assert stats.parsed == 3
+
+def test_prefilter_handles_unit_numbers_after_the_state():
+    phrase = "212 N. Scottsdale Rd Scottsdale, AZ #85255"
+    assert extract_all(phrase, prefilter=True) == []
+    phrase = "212 N. Scottsdale Rd #14 Scottsdale, AZ 85255"
+    assert [str(x) for x in extract_all(phrase, prefilter=True)] == [
+        "212 N Scottsdale Rd # 14 Scottsdale AZ 85255",
+    ]
+
+BYTES_PHRASE = """
+There are 13 cats at Jason's house in Phoenix, AZ. Jason lives at 13
+Maple St. Phoenix, Az 85053 and his mom lives at 456 Maple Cir
+Scottsdale, AZ 85255 with her BF.
+"""
+
+def test_extract_all_bytes_matches_prefiltered_extract_all():
+    expected = [repr(x) for x in extract_all(BYTES_PHRASE, prefilter=True)]
+    data = BYTES_PHRASE.encode("utf-8")
+    for buf in (data, bytearray(data), memoryview(data)):
+        assert [repr(x) for x in extract_all_bytes(buf)] == expected
+
+def test_extract_all_bytes_slices_the_buffer():
+    data = "Café at 13 Maple St. Phoenix, AZ 85053".encode("utf-8")
+    addr = extract_all_bytes(data)[0]
+    assert addr.span == (9, 39)
+    assert isinstance(addr.source_text, memoryview)
+    assert addr.source_text.tobytes() == b"13 Maple St. Phoenix, AZ 85053"
+
+def test_extract_all_bytes_reads_mmaps(tmp_path):
+    path = tmp_path / "addresses.txt"
+    path.write_bytes(BYTES_PHRASE.encode("utf-8"))
+    with open(str(path), "rb") as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    stats = ScanStats()
+    extracted = extract_all_bytes(mapped, stats=stats)
+    assert [str(x) for x in extracted] == [
+        "13 Maple St Phoenix Az 85053",
+        "456 Maple Cir Scottsdale AZ 85255",
+    ]
+    assert stats.pruned == 1
+    del extracted
+    mapped.close()
+
+def test_extract_all_fails_on_too_long_street_names():
+    phrase = "13 Old Mill Creek Bend Farm St Phoenix, AZ 85053"
+    addr1 = extract_all(phrase)[0]
+    assert addr1.error == "Street name too long"
+    assert addr1.is_valid == False
+
+def test_extract_all_fails_when_the_state_ends_the_text():
+    addr1 = extract_all("13 Maple St. Phoenix, AZ")[0]
+    assert addr1.error == "Invalid Address Format - Too short"
+
+def test_extract_all_can_infer_zipcodes():
+    phrase = "13 Maple St. Phoenix, AZ and 1 Main St St. Louis MO."
+    (phoenix, st_louis) = extract_all(phrase, infer_zipcode=True)
+    assert str(phoenix) == "13 Maple St Phoenix AZ"
+    assert phoenix.zipcode is None
+    assert "85053" in phoenix.zipcode_candidates
+    assert phoenix.source_text == "13 Maple St. Phoenix, AZ"
+    assert phoenix.to_dict()["zipcode_candidates"] == list(phoenix.zipcode_candidates)
+    assert st_louis.city == "St Louis"
+    assert "63103" in st_louis.zipcode_candidates
+
+def test_inferred_zipcodes_need_a_city_of_the_state():
+    addr1 = extract_all("13 Maple St. Nowhere, AZ", infer_zipcode=True)[0]
+    assert addr1.error == "Invalid City/State Combo"
+
+def test_inferring_keeps_addresses_with_zipcodes():
+    phrase = "456 Maple Cir Scottsdale, AZ 85255 and 13 Maple St. Phoenix, AZ 85255"
+    (scottsdale, phoenix) = extract_all(phrase, infer_zipcode=True)[:2]
+    assert scottsdale.zipcode == "85255"
+    assert scottsdale.zipcode_candidates is None
+    assert phoenix.error == "Invalid City/State/Zipcode Combo"
+
+def test_inferring_works_with_the_prefilter_and_streams():
+    phrase = "Call 555 1234. 13 Maple St. Phoenix, AZ or 456 Maple Cir Scottsdale, AZ 85255"
+    expected = [repr(x) for x in extract_all(phrase, infer_zipcode=True) if x.is_valid]
+    assert len(expected) == 2
+    prefiltered = extract_all(phrase, prefilter=True, infer_zipcode=True)
+    assert [repr(x) for x in prefiltered if x.is_valid] == expected
+    streamed = iter_extract(io.StringIO(phrase), infer_zipcode=True)
+    assert [repr(x) for x in streamed if x.is_valid] == expected
+
+def test_prefilter_reaches_a_state_ten_tokens_away_when_inferring():
+    # the window at 53824 ends at OH, before the zipcode that follows it
+    phrase = "53824 send at 6630 Washington Sq PH 245 Gates Mills OH 44040"
+    expected = [repr(x) for x in extract_all(phrase, infer_zipcode=True) if x.is_valid]
+    prefiltered = extract_all(phrase, prefilter=True, infer_zipcode=True)
+    assert [repr(x) for x in prefiltered if x.is_valid] == expected
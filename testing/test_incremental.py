@@ -0,0 +1,78 @@
+import random
+
+import pytest
+
+from address_extractor import ScanStats, extract_all
+from address_extractor.incremental import IncrementalExtractor
+
+PIECES = [
+    "13 Maple St. Phoenix, AZ 85053 ",
+    "456 Maple Cir Scottsdale, AZ 85255-1234\n",
+    "1010 W. COTTONWOOD LN. SURPRISE, AZ 85374 ",
+    "212 N. Scottsdale Rd #14 Scottsdale, AZ 85255 ",
+    "There are 13 cats in Phoenix, AZ. ",
+    "order 88 of 1200 ",
+    "Scottsdale, AZ ",
+    "85255 ",
+    "Maple ",
+    "7",
+    " ",
+    ",",
+]
+
+def valid(addresses):
+    return [(repr(x), x.span, x.source_text) for x in addresses if x.is_valid]
+
+def test_appends_match_extract_all():
+    extractor = IncrementalExtractor()
+    delta = extractor.append("13 Maple St. Phoenix, AZ")
+    assert delta.added == [] and delta.removed == []
+    delta = extractor.append(" 85053 and 456 Maple Cir")
+    assert [x.source_text for x in delta.added] == ["13 Maple St. Phoenix, AZ 85053"]
+    delta = extractor.append(" Scottsdale, AZ 85255-1234")
+    assert [x.source_text for x in delta.added] == ["456 Maple Cir Scottsdale, AZ 85255-1234"]
+    assert valid(extractor.addresses) == valid(extract_all(extractor.text))
+
+def test_edits_report_added_and_removed_addresses():
+    extractor = IncrementalExtractor("13 Maple St. Phoenix, AZ 85053 and 456 Maple Cir Scottsdale, AZ 85255")
+    (first, second) = extractor.addresses
+    start = extractor.text.index("85053")
+    delta = extractor.edit((start, start + 5), "85051")
+    assert delta.removed == [first]
+    assert [x.source_text for x in delta.added] == ["13 Maple St. Phoenix, AZ 85051"]
+    assert extractor.addresses[1] is second
+    assert valid(extractor.addresses) == valid(extract_all(extractor.text))
+    delta = extractor.edit((0, len(extractor.text)), "")
+    assert delta.added == [] and len(delta.removed) == 2
+    assert extractor.addresses == []
+    # a zipcode of another city makes the window run on into the next address
+    extractor = IncrementalExtractor("13 Maple St. Phoenix, AZ 85053 and 456 Maple Cir Scottsdale, AZ 85255")
+    delta = extractor.edit((start, start + 5), "85255")
+    assert len(delta.removed) == 2
+    assert [x.source_text for x in delta.added] == ["85255 and 456 Maple Cir Scottsdale, AZ 85255"]
+
+def test_random_edits_match_extract_all():
+    rand = random.Random(3)
+    extractor = IncrementalExtractor()
+    for _ in range(300):
+        text = "".join(rand.choice(PIECES) for _ in range(rand.randint(0, 3)))
+        if rand.random() < 0.4:
+            extractor.append(text)
+        else:
+            start = rand.randint(0, len(extractor.text))
+            end = min(len(extractor.text), start + rand.randint(0, 40))
+            extractor.edit((start, end), text)
+        assert valid(extractor.addresses) == valid(extract_all(extractor.text))
+
+def test_appends_parse_only_the_end_of_the_document():
+    extractor = IncrementalExtractor("13 Maple St. Phoenix, AZ 85053 " * 200)
+    stats = ScanStats()
+    delta = extractor.append("456 Maple Cir Scottsdale, AZ 85255")
+    assert len(delta.added) == 1
+    extractor.append(" and more", stats)
+    assert stats.candidates <= 2
+    assert len(extractor.addresses) == 201
+
+def test_edit_outside_the_text():
+    with pytest.raises(ValueError):
+        IncrementalExtractor("13 Maple St.").edit((5, 50), "")
@@ -0,0 +1,42 @@
+from address_extractor import extract_all, iter_extract, profiling
+
+PHRASE = """
+There are 13 cats at Jason's house in Phoenix, AZ. Jason lives at 13
+Maple St. Phoenix, Az 85053 and his mom lives at 456 Maple Cir
+Scottsdale, AZ 85255 with her BF.
+"""
+
+def test_profiling_is_disabled_by_default():
+    assert profiling.active is None
+
+def test_profile_counts_stages_rejections_and_documents():
+    with profiling.profile() as profiler:
+        extract_all(PHRASE)
+        extract_all("nothing to see")
+    assert profiling.active is None
+    assert profiler.candidates == 3
+    assert profiler.accepted == 2
+    assert profiler.rejections == {"Zipcode Not Found": 1}
+    assert (profiler.documents, profiler.tried) == (2, 3)
+    assert profiler.as_dict()["documents"] == 2
+    assert profiler.stage_calls["_extract_street_number"] == 3
+    assert profiler.stage_calls["_extract_city"] == 2
+    assert profiler.stage_seconds["_extract_city"] > 0
+    assert profiler.as_dict()["stages"]["_extract_state"]["calls"] == 3
+
+def test_callback_is_called_per_document():
+    calls = []
+    with profiling.profile(callback=lambda p, tried, accepted: calls.append((tried, accepted))):
+        list(iter_extract(PHRASE))
+    assert calls == [(3, 2)]
+
+def test_profilers_can_be_nested():
+    outer = profiling.enable()
+    try:
+        with profiling.profile() as inner:
+            extract_all(PHRASE)
+        assert profiling.active is outer
+        assert inner.candidates == 3
+        assert outer.candidates == 0
+    finally:
+        profiling.disable()
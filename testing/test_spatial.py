@@ -0,0 +1,60 @@
+import random
+from functools import lru_cache
+
+import pytest
+
+from address_extractor import extract_all, spatial, zipcode, zipcode_index
+
+@lru_cache(maxsize=None)
+def brute_force(latitude, longitude):
+    table = zipcode.index()
+    return sorted(
+        (spatial.distance_km(latitude, longitude, other_latitude, other_longitude),
+         zipcode_index.format_zipcode(number))
+        for (number, other_latitude, other_longitude)
+        in zip(table.zipcodes, table.latitudes, table.longitudes)
+    )
+
+def random_points(count):
+    rand = random.Random(7)
+    # include the antimeridian, where the aleutian zipcodes are on both sides
+    points = [(51.9, 179.99), (51.9, -179.99)]
+    for _ in range(count):
+        points.append((rand.uniform(15, 72), rand.uniform(-180, 180)))
+    return points
+
+def test_distance_km():
+    assert spatial.distance_km(33.45, -112.07, 33.45, -112.07) == 0
+    # one degree of latitude is about 111 km
+    assert spatial.distance_km(33, -112, 34, -112) == pytest.approx(111.2, abs=0.1)
+
+def test_nearest_zipcodes_match_a_linear_scan():
+    for (latitude, longitude) in random_points(4):
+        expected = brute_force(latitude, longitude)[:5]
+        found = spatial.nearest_zipcodes(latitude, longitude, 5)
+        assert [km for (_, km) in found] == pytest.approx([km for (km, _) in expected])
+
+def test_zipcodes_within_match_a_linear_scan():
+    for (latitude, longitude) in random_points(4):
+        expected = [
+            number for (km, number) in brute_force(latitude, longitude) if km <= 150
+        ]
+        found = spatial.zipcodes_within(latitude, longitude, 150)
+        assert sorted(number for (number, _) in found) == sorted(expected)
+        assert [km for (_, km) in found] == sorted(km for (_, km) in found)
+
+def test_a_zipcode_is_nearest_to_itself():
+    (latitude, longitude) = zipcode.coordinates("85255")
+    assert ("85255", 0.0) in spatial.nearest_zipcodes(latitude, longitude, 3)
+    assert spatial.zipcodes_within(latitude, longitude, 0)[0][1] == 0.0
+
+def test_degenerate_queries():
+    assert spatial.nearest_zipcodes(33.45, -112.07, 0) == []
+    assert spatial.zipcodes_within(33.45, -112.07, -1) == []
+    assert len(spatial.zipcodes_within(0, 0, 30000)) == len(zipcode.index())
+
+def test_addresses_have_coordinates():
+    (valid, invalid) = extract_all("13 Maple St. Phoenix, AZ 85053-1234 and 7 Main St. Nowhere")
+    assert valid.coordinates == zipcode.coordinates("85053")
+    assert invalid.coordinates is None
+    assert zipcode.coordinates("99999") is None
@@ -0,0 +1,110 @@
+import sys
+import threading
+
+from address_extractor import (
+    extract_all,
+    extract_many_threaded,
+    lazy,
+    profiling,
+    street_type,
+    unit_type,
+    vocabulary,
+    zipcode,
+)
+from address_extractor.cache import ParseCache
+
+DOCUMENTS = [
+    "13 Maple St. Phoenix, AZ 85053 and 456 Maple Cir Scottsdale, AZ 85255",
+    "There are 13 cats at Jason's house in Phoenix, AZ.",
+    "1010 W. COTTONWOOD LN. SURPRISE, AZ 85374-3628",
+    "212 N. Scottsdale Rd #14 Scottsdale, AZ 85255 or 1 Main St St. Louis MO 63103",
+    "Order 88 of 1200 items, batch 4411, 7 boxes.",
+] * 40
+
+def reprs(addresses):
+    return [(repr(x), x.span) for x in addresses]
+
+def run_threads(target, count=8):
+    barrier = threading.Barrier(count)
+    results = [None] * count
+    errors = []
+
+    def work(number):
+        barrier.wait()
+        try:
+            results[number] = target()
+        except Exception as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=work, args=(n,)) for n in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    return results
+
+def test_extract_all_from_many_threads_matches_one_thread():
+    # switch threads as often as possible to shake out races under the GIL
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        expected = [reprs(extract_all(doc)) for doc in DOCUMENTS]
+        cache = ParseCache(maxsize=16)
+        results = run_threads(
+            lambda: [reprs(extract_all(doc, cache=cache)) for doc in DOCUMENTS])
+    finally:
+        sys.setswitchinterval(interval)
+    assert all(result == expected for result in results)
+
+def test_profiler_counts_every_thread():
+    candidates = sum(len(extract_all(doc)) for doc in DOCUMENTS)
+    with profiling.profile() as profiler:
+        run_threads(lambda: [extract_all(doc) for doc in DOCUMENTS])
+    assert profiler.candidates == 8 * candidates
+    assert profiler.documents == 8 * len(DOCUMENTS)
+
+def test_reference_tables_load_once_across_threads():
+    loaders = [zipcode.states, street_type.street_types, unit_type.unit_types]
+    for loader in loaders:
+        loader.cache_clear()
+    results = run_threads(lambda: [loader() for loader in loaders] + [vocabulary.vocabulary()])
+    for tables in results:
+        assert all(table is expected for (table, expected) in zip(tables, results[0]))
+
+def test_reference_tables_are_frozen():
+    assert isinstance(zipcode.STATES, frozenset)
+    assert isinstance(street_type.STREET_TYPES, frozenset)
+    assert isinstance(unit_type.UNIT_TYPES, frozenset)
+
+def test_once_runs_the_loader_once():
+    calls = []
+
+    @lazy.once
+    def loader():
+        calls.append(None)
+        return object()
+
+    results = run_threads(loader)
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+    loader.cache_clear()
+    assert loader.cache_info().currsize == 0
+    assert loader() is not results[0]
+
+def test_extract_many_threaded_returns_results_in_order():
+    expected = [reprs(extract_all(doc)) for doc in DOCUMENTS]
+    results = extract_many_threaded(iter(DOCUMENTS), workers=4)
+    assert [reprs(x) for x in results] == expected
+
+def test_extract_many_threaded_unordered_returns_positions():
+    expected = [reprs(extract_all(doc)) for doc in DOCUMENTS]
+    results = list(extract_many_threaded(DOCUMENTS, workers=4, ordered=False))
+    assert sorted(position for (position, _) in results) == list(range(len(DOCUMENTS)))
+    for (position, addresses) in results:
+        assert reprs(addresses) == expected[position]
+
+def test_extract_many_threaded_can_stop_early():
+    results = extract_many_threaded(iter(DOCUMENTS), workers=2)
+    assert reprs(next(results)) == reprs(extract_all(DOCUMENTS[0]))
+    results.close()
@@ -0,0 +1,43 @@
+from address_extractor import Address, WINDOW_SIZE, tokenize_with_offsets, vocabulary
+from address_extractor.token_table import TokenTable
+
+TEXT = """
+Jason lives at 13 Maple St. Phoenix, Az 85053 , and his mom at
+212 N. Scottsdale Rd #14 Scottsdale, AZ 85255 . 7 .#5 x
+"""
+
+def window_on_its_own(text, start):
+    (tokens, offsets) = tokenize_with_offsets(text)
+    address = Address(tokens[start:start + WINDOW_SIZE], offsets[start:start + WINDOW_SIZE])
+    return (address.tokens, tuple(address.labels), address.offsets)
+
+def test_windows_match_windows_cleaned_on_their_own():
+    table = TokenTable(TEXT)
+    for start in range(len(table)):
+        assert table.window(start, start + WINDOW_SIZE) == window_on_its_own(TEXT, start)
+
+def test_windows_can_be_asked_for_in_any_order():
+    table = TokenTable(TEXT)
+    for start in [12, 3, 20, 0, 12]:
+        assert table.window(start, start + WINDOW_SIZE) == window_on_its_own(TEXT, start)
+
+def test_the_table_knows_the_numeric_tokens():
+    table = TokenTable("13 Maple St. 85053, #14")
+    assert table.raw == ["13", "Maple", "St.", "85053,", "#14"]
+    assert table.cleaned == ["13", "Maple", "St", "85053", "#14"]
+    assert table.numeric == [True, False, False, False, False]
+
+def test_entries_crossing_the_edges_of_a_window_are_not_matched():
+    trie = vocabulary.build_vocabulary({"az"})
+    vocabulary.add_entry(trie, "Foo Bar", vocabulary.STREET_TYPE)
+    text = "foo 1 2 3 4 5 6 7 8 9 foo bar AZ"
+    table = TokenTable(text, trie)
+    assert table.window(0, 13)[1][-3:] == (
+        vocabulary.STREET_TYPE, vocabulary.STREET_TYPE, vocabulary.STATE,
+    )
+    # a window cut after the first "foo" cannot match "foo bar"
+    (_, labels, _) = table.window(0, 11)
+    assert labels == tuple(vocabulary.label_tokens(text.split()[:11], trie))
+    assert labels[-1] == 0
+    (_, labels, _) = table.window(11, 13)
+    assert labels == (0, vocabulary.STATE)
@@ -0,0 +1,55 @@
+import pytest
+
+from address_extractor import zipcode
+
+np = pytest.importorskip("numpy")
+
+from address_extractor.validation import validate_places
+
+CITIES = ["SURPRISE", "Phoenix", "BadBad", "Saint Louis", "Scottsdale", "Holtsville"]
+STATES = ["AZ", "az", "AZ", "Missouri", "AZ", "NY"]
+ZIPCODES = ["85374-3628", "85053", "85053", "63103", "99999", "00501"]
+
+def test_validate_places_matches_is_valid_place():
+    result = validate_places(CITIES, STATES, ZIPCODES)
+    expected = [
+        zipcode.is_valid_place(city, state, zipcode_)
+        for (city, state, zipcode_) in zip(CITIES, STATES, ZIPCODES)
+    ]
+    assert result.mask.tolist() == expected == [True, True, False, True, False, True]
+
+def test_validate_places_returns_canonical_values():
+    result = validate_places(np.array(CITIES), np.array(STATES), np.array(ZIPCODES))
+    assert result.city.tolist() == [
+        "Surprise", "Phoenix", None, "Saint Louis", None, "Holtsville",
+    ]
+    assert result.state.tolist() == ["AZ", "AZ", None, "MO", None, "NY"]
+    assert result.zipcode.tolist() == ["85374", "85053", None, "63103", None, "00501"]
+
+def test_validate_places_accepts_integer_zipcodes():
+    result = validate_places(["Holtsville", "Phoenix"], ["NY", "AZ"], np.array([501, 123456]))
+    assert result.mask.tolist() == [True, False]
+    assert result.zipcode.tolist() == ["00501", None]
+
+def test_validate_places_rejects_malformed_zipcodes():
+    result = validate_places(["Phoenix"] * 3, ["AZ"] * 3, ["8505", "85053x", ""])
+    assert result.mask.tolist() == [False, False, False]
+
+def test_validate_places_requires_ascii_digits():
+    arabic_indic = "\u0668\u0665\u0660\u0665\u0663"
+    assert not zipcode.is_valid_place("Phoenix", "AZ", arabic_indic)
+    result = validate_places(["Phoenix", "Phoenix"], ["AZ", "AZ"], [arabic_indic, "85053"])
+    assert result.mask.tolist() == [False, True]
+
+def test_validate_places_accepts_empty_columns():
+    for zipcodes in ([], np.array([], dtype=str), np.array([], dtype=object)):
+        result = validate_places([], [], zipcodes)
+        assert result.mask.tolist() == []
+        assert result.mask.dtype == bool
+        assert result.city.tolist() == result.state.tolist() == result.zipcode.tolist() == []
+    with pytest.raises(ValueError):
+        validate_places(["Phoenix"], [], [])
+
+def test_validate_places_requires_equal_lengths():
+    with pytest.raises(ValueError):
+        validate_places(["Phoenix"], ["AZ", "AZ"], ["85053"])
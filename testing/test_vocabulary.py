@@ -0,0 +1,25 @@
+from address_extractor import vocabulary
+from address_extractor.vocabulary import DIRECTION, STATE, STREET_TYPE, UNIT_TYPE
+
+def test_label_tokens_labels_each_class():
+    tokens = "212 N Scottsdale Rd APT 14 Scottsdale AZ 85255".split()
+    assert vocabulary.label_tokens(tokens) == [
+        0, DIRECTION, 0, STREET_TYPE, UNIT_TYPE, 0, 0, STATE, 0,
+    ]
+
+def test_label_tokens_ignores_case_and_labels_hashes():
+    assert vocabulary.label_tokens(["sT", "#2", "#"]) == [
+        STREET_TYPE, UNIT_TYPE, UNIT_TYPE,
+    ]
+
+def test_tokens_can_have_several_classes():
+    # 'ct' is both Connecticut and Court
+    assert vocabulary.label_tokens(["CT"]) == [STATE | STREET_TYPE]
+
+def test_multi_word_entries_label_every_token():
+    trie = vocabulary.build_vocabulary({"az"})
+    vocabulary.add_entry(trie, "Foo Bar", STREET_TYPE)
+    tokens = ["foo", "foo", "Bar", "AZ", "bar"]
+    assert vocabulary.label_tokens(tokens, trie) == [
+        0, STREET_TYPE, STREET_TYPE, STATE, 0,
+    ]
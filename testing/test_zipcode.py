@@ -18,3 +18,45 @@ def test_is_zipcode_dashed_on_invalid_zipcode():
 def test_is_valid_for_valid_combo():
     assert zipcode.is_valid_place("SURPRISE", "AZ", "85374-3628") == True
 
+
+def test_by_number_finds_zipcode_info():
+    info = zipcode.by_number("85255")
+    assert info.city == "scottsdale"
+    assert info.state == "az"
+    assert info.state_name == "arizona"
+    assert not hasattr(info, "__dict__")
+
+def test_by_number_on_unknown_zipcode():
+    assert zipcode.by_number("99999") is None
+    assert zipcode.by_number("8525") is None
+
+def test_zipcode_infos_is_a_mapping():
+    infos = zipcode.ZIPCODE_INFOS
+    assert "85255" in infos
+    assert "99999" not in infos
+    assert infos["85255"].county == "maricopa"
+    assert len(infos) == len(zipcode.ZIPCODES)
+
+def test_zipcodes_for_a_city():
+    zipcodes = zipcode.zipcodes_for("Scottsdale", "AZ")
+    assert "85255" in zipcodes
+    assert list(zipcodes) == sorted(zipcodes)
+    assert zipcode.zipcodes_for("scottsdale", "arizona") == zipcodes
+    assert all(zipcode.by_number(number).city == "scottsdale" for number in zipcodes)
+    assert zipcode.zipcodes_for("Scottsdale", "NY") == ()
+    assert zipcode.zipcodes_for("Scottsdale", "nowhere") == ()
+
+def test_cities_of_a_state():
+    assert "phoenix" in zipcode.cities_of("AZ")
+    assert zipcode.cities_of("Arizona") == zipcode.cities_of("az")
+    assert "phoenix" not in zipcode.cities_of("MO")
+    assert zipcode.cities_of("nowhere") == ()
+
+def test_every_zipcode_is_in_the_reverse_index():
+    places = zipcode.PLACES
+    count = sum(
+        len(places.zipcodes(city, state))
+        for state in zipcode.STATES
+        for city in places.cities(state)
+    )
+    assert count == len(zipcode.ZIPCODES)
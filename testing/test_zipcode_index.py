@@ -0,0 +1,58 @@
+import pytest
+
+from address_extractor import (
+    datafile,
+    zipcode,
+    zipcode_index,
+)
+
+CSV_LINES = [
+    "zipcode,city,state_name,state,county,latitude,longitude",
+    "85255,Scottsdale,Arizona,AZ,Maricopa,33.6968,-111.8892",
+    "00501,Holtsville,New York,NY,Suffolk,40.8154,-73.0451",
+]
+
+def test_build_sorts_zipcodes():
+    index = zipcode_index.build(CSV_LINES)
+    assert list(index) == ["00501", "85255"]
+    assert index.find("00501") == 0
+    assert index.find("85255") == 1
+    assert index.find("85254") is None
+    assert index.find("8525") is None
+
+def test_written_index_loads_the_same_rows(tmp_path):
+    path = str(tmp_path / "zipcodes.idx")
+    built = zipcode_index.build(CSV_LINES)
+    zipcode_index.write(built, path)
+    loaded = zipcode_index.load(path)
+    assert len(loaded) == 2
+    assert loaded.row(1) == built.row(1)
+    assert loaded.row(1) == (
+        "85255", "Scottsdale", "Arizona", "AZ", "Maricopa", 33.6968, -111.8892,
+    )
+
+def test_packaged_index_matches_the_csv():
+    built = zipcode_index.build(datafile.read_us_zipcodes())
+    loaded = zipcode_index.load(zipcode_index.DEFAULT_PATH)
+    assert len(loaded) == len(built)
+    for row in range(0, len(built), 997):
+        assert loaded.row(row) == built.row(row)
+
+def test_load_rejects_other_files(tmp_path):
+    path = tmp_path / "not_an_index"
+    path.write_bytes(b"zipcode,city,state_name,state,county,latitude,longitude\n")
+    with pytest.raises(zipcode_index.InvalidIndexError):
+        zipcode_index.load(str(path))
+
+def test_load_index_replaces_the_zipcode_table(tmp_path):
+    path = str(tmp_path / "zipcodes.idx")
+    zipcode_index.write(zipcode_index.build(CSV_LINES), path)
+    try:
+        zipcode.load_index(path)
+        assert zipcode.is_zipcode_5("00501")
+        assert not zipcode.is_zipcode_5("85053")
+        assert zipcode.STATES == {"az", "ny"}
+        assert zipcode.by_number("00501").city == "holtsville"
+    finally:
+        zipcode.load_index(zipcode_index.DEFAULT_PATH)
+    assert zipcode.is_zipcode_5("85053")